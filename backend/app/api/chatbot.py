@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from typing import List
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
@@ -6,23 +7,32 @@ import uuid
 from datetime import datetime
 
 from app.db.database import get_db
-from app.bot.graph import process_query
+from app.core.serialization import dumps
+from app.db.archive import load_archived_turns
+from app.db.chat_search import search_chat_history
+from app.core.rate_limit import chat_admission, check_rate_limit
+from app.bot.graph import graph_metrics, process_query
 from app.models.product import Product
-from app.models.chat import ChatHistory as ChatHistoryModel
+from app.models.chat import ArchivedChat as ArchivedChatModel, ChatHistory as ChatHistoryModel
 from app.api.auth import get_current_user
-from app.schemas.chat_schema import ChatRequest, ChatResponse, ChatHistory as ChatHistorySchema
+from app.schemas.chat_schema import ChatRequest, ChatResponse, ChatSearchResult, ChatHistory as ChatHistorySchema
 
 router = APIRouter()
 
+async def rate_limited_user(current_user: dict = Depends(get_current_user)):
+    await check_rate_limit(current_user["id"])
+    return current_user
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_bot(
     request: ChatRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(rate_limited_user),
     db: Session = Depends(get_db)
 ):
     try:
         chat_id = request.chat_id or str(uuid.uuid4())
-        response = process_query(request.message)
+        async with chat_admission.slot():
+            response = await run_in_threadpool(process_query, request.message)
         
         title = None
         if not request.chat_id:
@@ -38,8 +48,15 @@ async def chat_with_bot(
         db.add(chat_history)
         db.commit()
         
-        return ChatResponse(response=response, chat_id=chat_id)
+        # The bot payload is already an encoded string; build the envelope
+        # directly rather than validating and re-serializing it as a model.
+        return Response(
+            content=dumps({"response": response, "chat_id": chat_id}),
+            media_type="application/json"
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -60,7 +77,18 @@ async def get_chat_history(
         if chat.chat_id not in chat_history:
             chat_history[chat.chat_id] = chat
     
-    return list(chat_history.values())
+    # Chats whose every turn has been moved out by retention
+    archived_chats = (
+        db.query(ArchivedChatModel)
+        .filter(ArchivedChatModel.user_id == current_user["id"])
+        .order_by(desc(ArchivedChatModel.timestamp))
+        .all()
+    )
+    for chat in archived_chats:
+        if chat.chat_id not in chat_history:
+            chat_history[chat.chat_id] = chat
+    
+    return sorted(chat_history.values(), key=lambda chat: chat.timestamp, reverse=True)
 
 @router.get("/chat/{chat_id}", response_model=List[ChatHistorySchema])
 async def get_chat_messages(
@@ -78,7 +106,29 @@ async def get_chat_messages(
         .all()
     )
     
-    if not messages:
+    history = [ChatHistorySchema.from_orm(msg) for msg in messages]
+    # Older turns may have been moved out of chat_history by retention
+    history += [
+        ChatHistorySchema.model_validate(turn)
+        for turn in load_archived_turns(db, current_user["id"], chat_id)
+    ]
+    
+    if not history:
         raise HTTPException(status_code=404, detail="Chat not found")
     
-    return [ChatHistorySchema.from_orm(msg) for msg in messages]
\ No newline at end of file
+    return sorted(history, key=lambda msg: msg.timestamp)
+
+@router.get("/search", response_class=Response, responses={200: {"model": List[ChatSearchResult]}})
+async def search_chats(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    results = search_chat_history(db, current_user["id"], q, limit, offset)
+    return Response(content=dumps(results), media_type="application/json")
+
+@router.get("/metrics")
+async def get_chat_metrics(current_user: dict = Depends(get_current_user)):
+    return graph_metrics()
@@ -0,0 +1,60 @@
+import hashlib
+from typing import List, Optional
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dumps, fetch_rows
+
+
+def parse_fields(model, fields: Optional[str]) -> List:
+    """Resolve a comma-separated `fields=` projection to model columns.
+
+    `id` is always included because it is the pagination cursor.
+    """
+    columns = model.__table__.columns
+    if not fields:
+        return [getattr(model, c.name) for c in columns]
+
+    names = ["id"] + [f.strip() for f in fields.split(",") if f.strip() and f.strip() != "id"]
+    unknown = [n for n in names if n not in columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [getattr(model, n) for n in dict.fromkeys(names)]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def keyset_page(
+    request: Request,
+    db: Session,
+    model,
+    columns: List,
+    conditions: List,
+    after_id: Optional[int],
+    limit: int,
+) -> Response:
+    stmt = select(*columns).where(*conditions)
+    if after_id is not None:
+        stmt = stmt.where(model.id > after_id)
+    stmt = stmt.order_by(model.id).limit(limit)
+
+    rows = fetch_rows(db, stmt)
+    body = dumps(rows)
+
+    headers = {"ETag": f'"{hashlib.sha1(body).hexdigest()}"'}
+    if len(rows) == limit:
+        next_id = rows[-1]["id"]
+        headers["X-Next-Cursor"] = str(next_id)
+        headers["Link"] = f'<{request.url.include_query_params(after_id=next_id)}>; rel="next"'
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
+from typing import Optional
+from app.db.database import get_db, get_read_db
+from app.db.bulk import bulk_ingest, detect_format, notify_batch_written, upsert_products
+from app.api.listing import keyset_page, parse_fields
 from app.models.product import Product
 from app.schemas.product_schema import ProductCreate, Product as ProductSchema
 
@@ -11,17 +14,57 @@ router = APIRouter()
 def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     db_product = Product(**product.dict())
     db.add(db_product)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Supplier already has a product with this name")
     db.refresh(db_product)
+    notify_batch_written(db, "products", [product.model_dump()])
     return db_product
 
-@router.get("/", response_model=List[ProductSchema])
-def get_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    products = db.query(Product).offset(skip).limit(limit).all()
-    return products
+@router.post("/bulk")
+async def bulk_create_products(request: Request, db: Session = Depends(get_db)):
+    return await bulk_ingest(
+        db,
+        request.stream(),
+        detect_format(request.headers.get("content-type")),
+        ProductCreate,
+        "products",
+        upsert_products,
+    )
+
+@router.get("/", response_class=Response)
+def get_products(
+    request: Request,
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = None,
+    category: Optional[str] = None,
+    brand: Optional[str] = None,
+    supplier_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    db: Session = Depends(get_read_db)
+):
+    conditions = []
+    if category:
+        conditions.append(Product.category == category)
+    if brand:
+        conditions.append(Product.brand == brand)
+    if supplier_id is not None:
+        conditions.append(Product.supplier_id == supplier_id)
+    if min_price is not None:
+        conditions.append(Product.price >= min_price)
+    if max_price is not None:
+        conditions.append(Product.price <= max_price)
+
+    return keyset_page(
+        request, db, Product, parse_fields(Product, fields), conditions, after_id, limit
+    )
 
 @router.get("/{product_id}", response_model=ProductSchema)
-def get_product(product_id: int, db: Session = Depends(get_db)):
+def get_product(product_id: int, db: Session = Depends(get_read_db)):
     product = db.query(Product).filter(Product.id == product_id).first()
     if product is None:
         raise HTTPException(status_code=404, detail="Product not found")
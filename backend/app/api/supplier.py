@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
-from app.models.supplier import Supplier
+from typing import Optional
+from app.db.database import get_db, get_read_db
+from app.db.bulk import bulk_ingest, detect_format, notify_batch_written, upsert_suppliers
+from app.api.listing import keyset_page, parse_fields
+from app.models.supplier import Supplier, SupplierCategory
 from app.schemas.supplier_schema import SupplierCreate, Supplier as SupplierSchema
 
 router = APIRouter()
@@ -10,18 +13,53 @@ router = APIRouter()
 @router.post("/", response_model=SupplierSchema)
 def create_supplier(supplier: SupplierCreate, db: Session = Depends(get_db)):
     db_supplier = Supplier(**supplier.dict())
+    db_supplier.categories = [
+        SupplierCategory(category=category) for category in dict.fromkeys(supplier.categories_offered)
+    ]
     db.add(db_supplier)
     db.commit()
     db.refresh(db_supplier)
+    notify_batch_written(db, "suppliers", [supplier.model_dump()])
     return db_supplier
 
-@router.get("/", response_model=List[SupplierSchema])
-def get_suppliers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    suppliers = db.query(Supplier).offset(skip).limit(limit).all()
-    return suppliers
+@router.post("/bulk")
+async def bulk_create_suppliers(request: Request, db: Session = Depends(get_db)):
+    return await bulk_ingest(
+        db,
+        request.stream(),
+        detect_format(request.headers.get("content-type")),
+        SupplierCreate,
+        "suppliers",
+        upsert_suppliers,
+    )
+
+@router.get("/", response_class=Response)
+def get_suppliers(
+    request: Request,
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = None,
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+    category: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    conditions = []
+    if category:
+        conditions.append(Supplier.id.in_(
+            select(SupplierCategory.supplier_id).where(SupplierCategory.category == category)
+        ))
+    if name:
+        conditions.append(Supplier.name == name)
+    if email:
+        conditions.append(Supplier.email == email)
+
+    return keyset_page(
+        request, db, Supplier, parse_fields(Supplier, fields), conditions, after_id, limit
+    )
 
 @router.get("/{supplier_id}", response_model=SupplierSchema)
-def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
+def get_supplier(supplier_id: int, db: Session = Depends(get_read_db)):
     supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
     if supplier is None:
         raise HTTPException(status_code=404, detail="Supplier not found")
@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def order_by_id(batch: Any, count: int) -> Optional[List[dict]]:
+    """Put a batched reply of `{"id": i, ...}` objects back in request order.
+
+    Returns None unless every id in 0..count-1 appears exactly once, so a
+    reply can never hand one request's answer to another.
+    """
+    if not isinstance(batch, list) or len(batch) != count:
+        return None
+    ordered = [None] * count
+    for item in batch:
+        index = item.get("id") if isinstance(item, dict) else None
+        if isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < count \
+                or ordered[index] is not None:
+            return None
+        ordered[index] = {k: v for k, v in item.items() if k != "id"}
+    return ordered
+
+
+class MicroBatcher:
+    """Coalesces calls from concurrent threads into one batched handler call.
+
+    The first caller opens a window of `window` seconds; every call that
+    arrives before it closes (or until `max_size` calls are queued) is sent
+    to `handler` as one list. `handler` returns one result per item, in
+    order; an Exception instance in the results is raised to that caller only.
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], List[Any]], window: float, max_size: int):
+        self.handler = handler
+        self.window = window
+        self.max_size = max_size
+        self._pending: List[Tuple[Any, Future, float]] = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._requests = 0
+        self._batches = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def submit(self, item: Any) -> Any:
+        future = Future()
+        batch = None
+        with self._lock:
+            self._pending.append((item, future, time.monotonic()))
+            if len(self._pending) >= self.max_size:
+                batch = self._take()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._dispatch(batch)
+        return future.result()
+
+    def _take(self) -> List[Tuple[Any, Future, float]]:
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Any, Future, float]]) -> None:
+        started = time.monotonic()
+        waits = [started - submitted for _, _, submitted in batch]
+        with self._lock:
+            self._requests += len(batch)
+            self._batches += 1
+            self._wait_total += sum(waits)
+            self._wait_max = max(self._wait_max, *waits)
+
+        try:
+            results = self.handler([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch handler returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(batch)} failed: {str(e)}")
+            results = [e] * len(batch)
+
+        for (_, future, _), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "batches": self._batches,
+                "avg_batch_size": self._requests / self._batches if self._batches else 0,
+                "avg_added_latency_ms": 1000 * self._wait_total / self._requests if self._requests else 0,
+                "max_added_latency_ms": 1000 * self._wait_max,
+            }
@@ -0,0 +1,129 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUERY_TYPES = {
+    "product_search", "product_details", "supplier_search",
+    "supplier_details", "supplier_products", "catalog_stats",
+}
+ENTITY_FIELDS = {
+    "category", "min_price", "max_price", "brand", "name",
+    "sort", "supplier_name", "product_type",
+}
+NUMERIC_FIELDS = {"min_price", "max_price"}
+
+
+def validate_analysis(analysis: Any) -> Optional[str]:
+    """Return why an analyzer result is unusable, or None when it is valid.
+
+    Prices given as numeric strings ("500") are converted to floats in place.
+    """
+    if not isinstance(analysis, dict):
+        return "analysis is not an object"
+    if analysis.get("query_type") not in QUERY_TYPES:
+        return f"unknown query_type {analysis.get('query_type')!r}"
+    entities = analysis.get("entities")
+    if not isinstance(entities, dict):
+        return "entities is not an object"
+    unknown = set(entities) - ENTITY_FIELDS
+    if unknown:
+        return f"unknown entity fields {sorted(unknown)}"
+    for field in NUMERIC_FIELDS & set(entities):
+        value = entities[field]
+        if value is None or isinstance(value, (int, float)) and not isinstance(value, bool):
+            continue
+        if not isinstance(value, str):
+            return f"{field} is not a number"
+        try:
+            entities[field] = float(value)
+        except ValueError:
+            return f"{field} is not a number"
+    return None
+
+
+class ModelCascade:
+    """Tries a ladder of chat models, cheapest first, escalating on bad output.
+
+    A rung's answer is accepted when it parses, passes `validate_analysis`
+    and reports a `confidence` of at least `min_confidence`. When every rung
+    is unsure, the last structurally valid answer is returned.
+    """
+
+    def __init__(self, models: List[Tuple[str, Any]], min_confidence: float):
+        self.models = models
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self._stats = {name: {"calls": 0, "accepted": 0, "rejected": 0, "latency_total": 0.0}
+                       for name, _ in models}
+
+    def call(self, rung: int, messages: List) -> str:
+        name, model = self.models[rung]
+        start = time.perf_counter()
+        try:
+            return model.invoke(messages).content
+        finally:
+            with self._lock:
+                self._stats[name]["calls"] += 1
+                self._stats[name]["latency_total"] += time.perf_counter() - start
+
+    def review(self, analysis: Any) -> Tuple[Optional[str], bool]:
+        """Return (reason to escalate, whether the answer is still usable)."""
+        problem = validate_analysis(analysis)
+        if problem:
+            return problem, False
+        if analysis.get("confidence") is None:
+            # An answer that doesn't say how sure it is isn't trusted as sure
+            if self.min_confidence > 0:
+                return "confidence missing", True
+            return None, True
+        try:
+            confidence = float(analysis["confidence"])
+        except (TypeError, ValueError):
+            return "confidence is not a number", True
+        if confidence < self.min_confidence:
+            return f"confidence {confidence:.2f} below {self.min_confidence:.2f}", True
+        return None, True
+
+    def record(self, rung: int, problem: Optional[str]) -> None:
+        name = self.models[rung][0]
+        with self._lock:
+            self._stats[name]["rejected" if problem else "accepted"] += 1
+        if problem:
+            logger.info(f"Rejected {name} analysis: {problem}")
+
+    def run(self, messages: List, start: int = 0, fallback: Any = None) -> Any:
+        problem = "no models left to try"
+        for rung in range(start, len(self.models)):
+            try:
+                analysis = json.loads(self.call(rung, messages))
+                problem, usable = self.review(analysis)
+            except Exception as e:
+                analysis, problem, usable = None, f"unparseable output: {str(e)}", False
+            self.record(rung, problem)
+            if problem is None:
+                return analysis
+            if usable:
+                fallback = analysis
+        if fallback is not None:
+            return fallback
+        raise ValueError(f"No model produced a valid analysis: {problem}")
+
+    def stats(self) -> dict:
+        """Per-model call latency and rejection rate.
+
+        The first rung's rejection rate is the cascade's escalation rate.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "calls": s["calls"],
+                    "avg_latency_ms": 1000 * s["latency_total"] / s["calls"] if s["calls"] else 0,
+                    "rejection_rate": s["rejected"] / (s["accepted"] + s["rejected"])
+                    if s["accepted"] + s["rejected"] else 0,
+                }
+                for name, s in self._stats.items()
+            }
@@ -1,5 +1,6 @@
 import os
-from typing import TypedDict, Annotated, Sequence, List, Dict, Any
+from typing import TypedDict, Annotated, Sequence, List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import json
 import logging
@@ -17,8 +18,15 @@ from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 
 from app.models.product import Product
-from app.models.supplier import Supplier
-from app.db.database import get_db
+from app.models.supplier import Supplier, SupplierCategory
+from app.models.stats import PriceStats, SupplierStats
+from app.db.database import get_read_db
+from app.core.serialization import dumps_str, fetch_rows
+from app.bot.vocabulary import get_vocabulary, normalize
+from app.bot.batching import MicroBatcher, order_by_id
+from app.bot.cascade import ModelCascade
+from app.bot.speculation import Speculation, predict, speculation_stats
+from app.core.config import settings
 
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -32,11 +40,25 @@ class AgentState(TypedDict):
     messages: Annotated[Sequence[HumanMessage | AIMessage], add_messages]
     query_type: str
     entities: dict
+    speculation: Optional[Speculation]
 
-llm = ChatGroq(
-    model="mixtral-8x7b-32768",  
-    temperature=0.2,
-    api_key=GROQ_API_KEY
+# Analyzer models, cheapest first; answers that fail validation or report
+# low confidence escalate to the next model
+analyzer_cascade = ModelCascade(
+    [
+        (model, ChatGroq(model=model, temperature=0.2, api_key=GROQ_API_KEY))
+        for model in settings.ANALYZER_MODELS.split(",")
+    ],
+    min_confidence=settings.ANALYZER_MIN_CONFIDENCE
+)
+
+PRODUCT_COLUMNS = (
+    Product.id, Product.name, Product.brand, Product.price,
+    Product.category, Product.description, Product.supplier_id
+)
+SUPPLIER_COLUMNS = (
+    Supplier.id, Supplier.name, Supplier.email, Supplier.phone,
+    Supplier.address, Supplier.categories_offered
 )
 
 @tool
@@ -51,44 +73,37 @@ def search_products(query: str = "", filters: dict = None) -> str:
     Returns:
         JSON string containing matched products and count
     """
-    db = next(get_db())
+    db = next(get_read_db())
     
     try:
-        stmt = select(Product)
+        stmt = select(*PRODUCT_COLUMNS)
         if filters:
+            vocabulary = get_vocabulary()
             for key, value in filters.items():
-                if value and hasattr(Product, key):
-                    if key == 'category':
-                        stmt = stmt.where(Product.category.ilike(f"%{value}%"))
-                    elif key == 'max_price':
-                        stmt = stmt.where(Product.price <= float(value))
-                    elif key == 'min_price':
-                        stmt = stmt.where(Product.price >= float(value))
-                    elif key in ['name', 'brand']:
-                        stmt = stmt.where(getattr(Product, key).ilike(f"%{value}%"))
+                if not value:
+                    continue
+                if key in ['category', 'brand']:
+                    # Exact match on the indexed column when the entity maps
+                    # to a known catalog value, substring search otherwise
+                    canonical = vocabulary.canonical(key, value)
+                    if canonical:
+                        stmt = stmt.where(getattr(Product, key) == canonical)
                     else:
-                        stmt = stmt.where(getattr(Product, key) == value)
-        
-        products = db.execute(stmt).scalars().all()
+                        stmt = stmt.where(getattr(Product, key).ilike(f"%{value}%"))
+                elif key == 'max_price':
+                    stmt = stmt.where(Product.price <= float(value))
+                elif key == 'min_price':
+                    stmt = stmt.where(Product.price >= float(value))
+                elif key == 'name':
+                    stmt = stmt.where(Product.name.ilike(f"%{value}%"))
+                elif hasattr(Product, key):
+                    stmt = stmt.where(getattr(Product, key) == value)
         
-        result = {
-            "products": [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "brand": p.brand,
-                    "price": p.price,
-                    "category": p.category,
-                    "description": p.description,
-                    "supplier_id": p.supplier_id
-                } for p in products
-            ],
-            "count": len(products)
-        }
-        return json.dumps(result)
+        products = fetch_rows(db, stmt)
+        return dumps_str({"products": products, "count": len(products)})
     except Exception as e:
         logger.error(f"Error searching products: {str(e)}")
-        return json.dumps({"error": str(e)})
+        return dumps_str({"error": str(e)})
     finally:
         db.close()
 
@@ -103,28 +118,18 @@ def get_product_details(product_id: int) -> str:
     Returns:
         JSON string containing product details
     """
-    db = next(get_db())
+    db = next(get_read_db())
     
     try:
-        product = db.query(Product).filter(Product.id == product_id).first()
+        products = fetch_rows(db, select(*PRODUCT_COLUMNS).where(Product.id == product_id))
         
-        if not product:
-            return json.dumps({"error": f"Product with ID {product_id} not found"})
-            
-        result = {
-            "id": product.id,
-            "name": product.name,
-            "brand": product.brand,
-            "price": product.price,
-            "category": product.category,
-            "description": product.description,
-            "supplier_id": product.supplier_id
-        }
+        if not products:
+            return dumps_str({"error": f"Product with ID {product_id} not found"})
         
-        return json.dumps(result)
+        return dumps_str(products[0])
     
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps_str({"error": str(e)})
     finally:
         db.close()
 
@@ -140,16 +145,24 @@ def search_suppliers(query: str, filters: dict = None) -> str:
     Returns:
         JSON string containing matched suppliers and count
     """
-    db = next(get_db())
+    db = next(get_read_db())
     
     try:
-        stmt = select(Supplier)
+        stmt = select(*SUPPLIER_COLUMNS)
         
         if filters:
+            vocabulary = get_vocabulary()
             if "category" in filters and filters["category"]:
-                stmt = stmt.where(Supplier.categories_offered.contains([filters["category"]]))
+                category = vocabulary.canonical("category", filters["category"]) or filters["category"]
+                stmt = stmt.join(SupplierCategory, SupplierCategory.supplier_id == Supplier.id).where(
+                    SupplierCategory.category == category
+                )
             if "name" in filters and filters["name"]:
-                stmt = stmt.where(Supplier.name.ilike(f"%{filters['name']}%"))
+                name = vocabulary.canonical("supplier", filters["name"])
+                if name:
+                    stmt = stmt.where(Supplier.name == name)
+                else:
+                    stmt = stmt.where(Supplier.name.ilike(f"%{filters['name']}%"))
         
         elif query:
             stmt = stmt.where(
@@ -158,29 +171,15 @@ def search_suppliers(query: str, filters: dict = None) -> str:
                 (Supplier.address.ilike(f"%{query}%"))
             )
         
-        suppliers = db.execute(stmt).scalars().all()
+        suppliers = fetch_rows(db, stmt)
         
         if not suppliers:
-            return json.dumps({"suppliers": [], "count": 0, "message": "No suppliers found matching your criteria."})
-            
-        result = {
-            "suppliers": [
-                {
-                    "id": s.id,
-                    "name": s.name,
-                    "email": s.email,
-                    "phone": s.phone,
-                    "address": s.address,
-                    "categories_offered": s.categories_offered
-                } for s in suppliers
-            ],
-            "count": len(suppliers)
-        }
+            return dumps_str({"suppliers": [], "count": 0, "message": "No suppliers found matching your criteria."})
         
-        return json.dumps(result)
+        return dumps_str({"suppliers": suppliers, "count": len(suppliers)})
     
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps_str({"error": str(e)})
     finally:
         db.close()
 
@@ -196,30 +195,21 @@ def get_supplier_details(supplier_id: int) -> str:
         JSON string containing supplier details and products count
     """
     logger.info(f"Fetching supplier details for ID: {supplier_id}")
-    db = next(get_db())
+    db = next(get_read_db())
     
     try:
-        supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
-        if not supplier:
-            return json.dumps({"error": "Supplier not found"})
-            
-        # Get supplier's products
-        products = db.query(Product).filter(Product.supplier_id == supplier_id).all()
+        suppliers = fetch_rows(db, select(*SUPPLIER_COLUMNS).where(Supplier.id == supplier_id))
+        if not suppliers:
+            return dumps_str({"error": "Supplier not found"})
         
-        result = {
-            "supplier": {
-                "id": supplier.id,
-                "name": supplier.name,
-                "email": supplier.email,
-                "phone": supplier.phone,
-                "address": supplier.address,
-                "categories_offered": supplier.categories_offered,
-                "products_count": len(products)
-            }
-        }
-        return json.dumps(result)
+        supplier = suppliers[0]
+        supplier["products_count"] = db.execute(
+            select(SupplierStats.product_count).where(SupplierStats.supplier_id == supplier_id)
+        ).scalar() or 0
+        
+        return dumps_str({"supplier": supplier})
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps_str({"error": str(e)})
     finally:
         db.close()
 
@@ -234,46 +224,73 @@ def get_supplier_products(supplier_id: int) -> str:
     Returns:
         JSON string containing supplier info and their products
     """
-    db = next(get_db())
+    db = next(get_read_db())
     
     try:
-        supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
+        suppliers = fetch_rows(db, select(Supplier.id, Supplier.name).where(Supplier.id == supplier_id))
         
-        if not supplier:
-            return json.dumps({"error": f"Supplier with ID {supplier_id} not found"})
+        if not suppliers:
+            return dumps_str({"error": f"Supplier with ID {supplier_id} not found"})
         
-        products = db.query(Product).filter(Product.supplier_id == supplier_id).all()
+        products = fetch_rows(
+            db,
+            select(*PRODUCT_COLUMNS[:-1]).where(Product.supplier_id == supplier_id)
+        )
         
-        result = {
-            "supplier": {
-                "id": supplier.id,
-                "name": supplier.name
-            },
-            "products": [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "brand": p.brand,
-                    "price": p.price,
-                    "category": p.category,
-                    "description": p.description
-                } for p in products
-            ],
-            "count": len(products)
-        }
+        return dumps_str({"supplier": suppliers[0], "products": products, "count": len(products)})
+    
+    except Exception as e:
+        return dumps_str({"error": str(e)})
+    finally:
+        db.close()
+
+@tool
+def get_catalog_stats(dimension: str = "category", value: str = "") -> str:
+    """
+    Get product counts and min/max/avg prices from the maintained aggregates.
+    
+    Args:
+        dimension: Either "category" or "brand"
+        value: Category or brand to report on; every value when empty
+        
+    Returns:
+        JSON string containing stats rows and count
+    """
+    db = next(get_read_db())
+    
+    try:
+        if dimension not in ("category", "brand"):
+            return dumps_str({"error": f"Unknown stats dimension: {dimension}"})
+        
+        stmt = select(
+            PriceStats.dimension, PriceStats.value, PriceStats.product_count,
+            PriceStats.min_price, PriceStats.max_price, PriceStats.avg_price
+        ).where(PriceStats.dimension == dimension).order_by(PriceStats.value)
+        if value:
+            stmt = stmt.where(PriceStats.value == (get_vocabulary().canonical(dimension, value) or value))
         
-        return json.dumps(result)
+        stats = fetch_rows(db, stmt)
+        return dumps_str({"stats": stats, "count": len(stats)})
     
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps_str({"error": str(e)})
     finally:
         db.close()
 
-def query_analyzer(state: AgentState) -> AgentState:
-    human_message = state["messages"][-1]
-    query = human_message.content
+def find_supplier_id(name: str):
+    supplier_id = get_vocabulary().supplier_id(name)
+    if supplier_id is not None:
+        return supplier_id
     
-    system_prompt = """
+    db = next(get_read_db())
+    try:
+        return db.execute(
+            select(Supplier.id).where(Supplier.name.ilike(f"%{name}%")).order_by(Supplier.id).limit(1)
+        ).scalar()
+    finally:
+        db.close()
+
+ANALYZER_PROMPT = """
     You are a product and supplier query analyzer. Analyze the user query and determine:
     1. Query type (choose one):
         - 'product_search': For finding products with filters
@@ -281,6 +298,7 @@ def query_analyzer(state: AgentState) -> AgentState:
         - 'supplier_search': For finding suppliers
         - 'supplier_details': For specific supplier information
         - 'supplier_products': For finding products from a specific supplier
+        - 'catalog_stats': For counts, price ranges or average prices of a category or brand
     
     2. Extract all relevant entities including:
         - category: Product category (electronics, gaming, accessories, etc.)
@@ -304,9 +322,13 @@ def query_analyzer(state: AgentState) -> AgentState:
             "sort": "<sort_preference>",
             "supplier_name": "<supplier>",
             "product_type": "<type>"
-        }
+        },
+        "confidence": <number between 0 and 1>
     }
     
+    Only include entities that appear in the query. Always set "confidence" to
+    how sure you are that the query type and entities are correct.
+    
     Example 1: "Find me a gaming monitor under $500"
     {
         "query_type": "product_search",
@@ -314,7 +336,8 @@ def query_analyzer(state: AgentState) -> AgentState:
             "category": "gaming",
             "product_type": "monitor",
             "max_price": 500
-        }
+        },
+        "confidence": 0.95
     }
     
     Example 2: "Show me all products from TechMaster sorted by price"
@@ -323,18 +346,97 @@ def query_analyzer(state: AgentState) -> AgentState:
         "entities": {
             "supplier_name": "TechMaster",
             "sort": "price_asc"
-        }
+        },
+        "confidence": 0.8
+    }
+    
+    Example 3: "What's the price range of gaming products?"
+    {
+        "query_type": "catalog_stats",
+        "entities": {
+            "category": "gaming"
+        },
+        "confidence": 0.9
     }
     """
+
+BATCH_ANALYZER_PROMPT = ANALYZER_PROMPT + """
+    You will receive a JSON array of numbered user queries instead of a single
+    query. Analyze each one independently and return a JSON array with exactly
+    one analysis object per query. Each object must include the "id" of the
+    query it answers.
+    """
+
+def analyze_query(query: str, start: int = 0, fallback: dict = None) -> dict:
+    return analyzer_cascade.run([
+        SystemMessage(content=ANALYZER_PROMPT),
+        HumanMessage(content=query)
+    ], start=start, fallback=fallback)
+
+def analyze_queries(queries: List[str]) -> List[Any]:
+    """Analyze several queries with one LLM call, sharing the system prompt."""
+    if len(queries) == 1:
+        return [analyze_query(queries[0])]
     
+    analyses = [None] * len(queries)
     try:
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=query)
-        ]
-        
-        response = llm.invoke(messages)
-        analysis = json.loads(response.content)
+        batch = order_by_id(json.loads(analyzer_cascade.call(0, [
+            SystemMessage(content=BATCH_ANALYZER_PROMPT),
+            HumanMessage(content=dumps_str([{"id": i, "query": q} for i, q in enumerate(queries)]))
+        ])), len(queries))
+        if batch is not None:
+            analyses = batch
+        else:
+            logger.warning(f"Batched analysis returned a malformed result for {len(queries)} queries")
+    except Exception as e:
+        logger.error(f"Batched query analysis error: {str(e)}")
+    
+    def finish(query, analysis):
+        if analysis is None:
+            return analyze_query(query)
+        problem, usable = analyzer_cascade.review(analysis)
+        analyzer_cascade.record(0, problem)
+        if problem is None:
+            return analysis
+        return analyze_query(query, start=1, fallback=analysis if usable else None)
+    
+    # Items the batch call didn't settle are retried individually and
+    # concurrently, so no caller waits on the others' retries
+    futures = [analyzer_pool.submit(finish, q, a) for q, a in zip(queries, analyses)]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
+analyzer_pool = ThreadPoolExecutor(
+    max_workers=settings.ANALYZER_BATCH_MAX_SIZE,
+    thread_name_prefix="analyzer"
+)
+
+analyzer_batcher = MicroBatcher(
+    analyze_queries,
+    window=settings.ANALYZER_BATCH_WINDOW_MS / 1000,
+    max_size=settings.ANALYZER_BATCH_MAX_SIZE
+) if settings.ANALYZER_BATCH_ENABLED else None
+
+# Runs the DB query `predict` guesses while the analyzer LLM call is in flight
+speculation_pool = ThreadPoolExecutor(
+    max_workers=settings.SPECULATION_WORKERS,
+    thread_name_prefix="speculation"
+) if settings.SPECULATION_ENABLED else None
+
+def query_analyzer(state: AgentState) -> AgentState:
+    human_message = state["messages"][-1]
+    query = human_message.content
+    
+    try:
+        if analyzer_batcher:
+            analysis = analyzer_batcher.submit(query)
+        else:
+            analysis = analyze_query(query)
         
         state["query_type"] = analysis["query_type"]
         state["entities"] = analysis["entities"]
@@ -346,87 +448,120 @@ def query_analyzer(state: AgentState) -> AgentState:
     
     return state
 
+def plan_db_query(query_type: str, entities: dict):
+    """Map an analysis to (tool, args), or None when there is nothing to run.
+
+    Category, brand and supplier names are canonicalized here so that plans
+    built from the analyzer and from `predict` compare equal.
+    """
+    vocabulary = get_vocabulary()
+    
+    def canonical(kind, value):
+        return vocabulary.canonical(kind, value) or value
+    
+    if query_type == "product_search":
+        filters = {}
+        if entities.get("category"):
+            filters["category"] = canonical("category", entities["category"])
+        if entities.get("max_price"):
+            filters["max_price"] = float(entities["max_price"])
+        if entities.get("min_price"):
+            filters["min_price"] = float(entities["min_price"])
+        if entities.get("brand"):
+            filters["brand"] = canonical("brand", entities["brand"])
+        if entities.get("product_type"):
+            filters["name"] = entities["product_type"]
+        return search_products, {"query": "", "filters": filters}
+    
+    if query_type == "supplier_search":
+        filters = {}
+        if entities.get("category"):
+            filters["category"] = canonical("category", entities["category"])
+        if entities.get("name"):
+            filters["name"] = canonical("supplier", entities["name"])
+        return search_suppliers, {"query": "", "filters": filters}
+    
+    if query_type == "catalog_stats":
+        if entities.get("brand") and not entities.get("category"):
+            return get_catalog_stats, {"dimension": "brand", "value": canonical("brand", entities["brand"])}
+        return get_catalog_stats, {
+            "dimension": "category",
+            "value": canonical("category", entities["category"]) if entities.get("category") else ""
+        }
+    
+    if query_type in ("supplier_details", "supplier_products") and entities.get("supplier_name"):
+        supplier_id = find_supplier_id(entities["supplier_name"])
+        if supplier_id is None:
+            return None
+        tool_fn = get_supplier_details if query_type == "supplier_details" else get_supplier_products
+        return tool_fn, {"supplier_id": supplier_id}
+    
+    return None
+
+def plan_key(plan) -> tuple:
+    """Comparison key for a plan; product names match up to plurals and punctuation."""
+    tool_fn, args = plan
+    filters = args.get("filters") or {}
+    if filters.get("name"):
+        args = {**args, "filters": {**filters, "name": normalize(filters["name"])}}
+    return tool_fn.name, args
+
+def start_speculation(query: str):
+    """Launch the DB query `predict` expects, overlapping the analyzer call."""
+    if speculation_pool is None:
+        return None
+    try:
+        query_type, entities = predict(query, get_vocabulary())
+        # Without a catalog signal the guess would be an unfiltered scan
+        if not entities:
+            return None
+        plan = plan_db_query(query_type, entities)
+        if plan is None:
+            return None
+        return Speculation(plan_key(plan), speculation_pool, plan[0].invoke, plan[1])
+    except Exception as e:
+        logger.error(f"Speculation error: {str(e)}")
+        return None
+
 def execute_db_query(state: AgentState) -> AgentState:
+    speculation = state.get("speculation")
     try:
-        query_type = state["query_type"]
-        entities = state["entities"]
+        plan = plan_db_query(state["query_type"], state["entities"])
         result = None
         
-        if query_type == "product_search":
-            filters = {}
-            if "category" in entities and entities["category"]:
-                filters["category"] = entities["category"]
-            if "max_price" in entities and entities["max_price"]:
-                filters["max_price"] = entities["max_price"]
-            if "min_price" in entities and entities["min_price"]:
-                filters["min_price"] = entities["min_price"]
-            if "brand" in entities and entities["brand"]:
-                filters["brand"] = entities["brand"]
-            if "product_type" in entities and entities["product_type"]:
-                filters["name"] = entities["product_type"]
-                
-            result = search_products.invoke({"query": "", "filters": filters})
-            
-        elif query_type == "supplier_search":
-            filters = {}
-            if "category" in entities:
-                filters["category"] = entities["category"]
-            if "name" in entities:
-                filters["name"] = entities["name"]
-                
-            result = search_suppliers.invoke({"query": "", "filters": filters})
-            
-        elif query_type == "supplier_details":
-            if "supplier_name" in entities:
-                supplier_results = json.loads(
-                    search_suppliers.invoke({
-                        "query": "", 
-                        "filters": {"name": entities["supplier_name"]}
-                    })
-                )
-                if supplier_results.get("suppliers") and len(supplier_results["suppliers"]) > 0:
-                    supplier_id = supplier_results["suppliers"][0]["id"]
-                    result = get_supplier_details.invoke({"supplier_id": supplier_id})
-            
-        elif query_type == "supplier_products":
-            if "supplier_name" in entities:
-                supplier_results = json.loads(
-                    search_suppliers.invoke({
-                        "query": "", 
-                        "filters": {"name": entities["supplier_name"]}
-                    })
-                )
-                if supplier_results.get("suppliers") and len(supplier_results["suppliers"]) > 0:
-                    supplier_id = supplier_results["suppliers"][0]["id"]
-                    result = get_supplier_products.invoke({"supplier_id": supplier_id})
+        if plan is None:
+            if speculation:
+                speculation.discard()
+        else:
+            if speculation:
+                result = speculation.take(plan_key(plan))
+            if result is None:
+                tool_fn, args = plan
+                result = tool_fn.invoke(args)
                     
         if result:
             state["messages"].append(AIMessage(content=result))
         else:
-            state["messages"].append(AIMessage(content=json.dumps({
+            state["messages"].append(AIMessage(content=dumps_str({
                 "error": "No results found for your query"
             })))
             
     except Exception as e:
-        state["messages"].append(AIMessage(content=json.dumps({
+        if speculation:
+            speculation.discard()
+        state["messages"].append(AIMessage(content=dumps_str({
             "error": "An error occurred while processing your request"
         })))
     
     return state
 
 def summarize_results(state: AgentState) -> AgentState:
-    try:
-        data_message = state["messages"][-1]
-        data = json.loads(data_message.content)
-        
-        if "error" in data:
-            state["messages"][-1] = AIMessage(content=json.dumps(data))
-            return state
-            
-        state["messages"][-1] = AIMessage(content=json.dumps(data))
-        
-    except Exception as e:
-        state["messages"].append(AIMessage(content=json.dumps({
+    # Tool payloads are encoded exactly once by the tools themselves, so the
+    # final message is passed through as-is instead of being decoded and
+    # re-encoded here.
+    data_message = state["messages"][-1]
+    if not isinstance(data_message, AIMessage) or not data_message.content:
+        state["messages"].append(AIMessage(content=dumps_str({
             "error": "An error occurred while processing the results"
         })))
     
@@ -449,12 +584,21 @@ def build_graph() -> StateGraph:
 
 chatbot_graph = build_graph()
 
+def graph_metrics() -> dict:
+    return {
+        "analyzer_batching": analyzer_batcher.stats() if analyzer_batcher else None,
+        "analyzer_models": analyzer_cascade.stats(),
+        "speculation": speculation_stats.snapshot()
+    }
+
 def process_query(query: str) -> str:
+    speculation = start_speculation(query)
     try:
         initial_state = {
             "messages": [HumanMessage(content=query)],
             "query_type": "",
-            "entities": {}
+            "entities": {},
+            "speculation": speculation
         }
         
         final_state = chatbot_graph.invoke(initial_state)
@@ -464,10 +608,12 @@ def process_query(query: str) -> str:
             return final_message.content
             
     except Exception:
-        return json.dumps({
+        if speculation:
+            speculation.discard()
+        return dumps_str({
             "error": "An error occurred while processing your request"
         })
     
-    return json.dumps({
+    return dumps_str({
         "error": "Could not understand your request"
     })
\ No newline at end of file
@@ -0,0 +1,152 @@
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Callable, Optional, Tuple
+
+from app.bot.vocabulary import CatalogVocabulary, normalize
+
+logger = logging.getLogger(__name__)
+
+_PRICE = r"\$?\s*(\d+(?:\.\d+)?)"
+_BETWEEN = re.compile(rf"between\s+{_PRICE}\s+(?:and|to|-)\s+{_PRICE}")
+_MAX_PRICE = re.compile(rf"(?:under|below|less than|cheaper than|up to|max(?:imum)?|<)\s*{_PRICE}")
+_MIN_PRICE = re.compile(rf"(?:over|above|more than|at least|min(?:imum)?|>)\s*{_PRICE}")
+_STATS = re.compile(r"\b(price range|average price|avg price|how many|cheapest price|most expensive price)\b")
+
+
+def _find(vocabulary: CatalogVocabulary, kind: str, words: list) -> Optional[str]:
+    """Longest run of 1-3 words that is an exact (normalized) vocabulary entry."""
+    index = {"category": vocabulary.categories, "brand": vocabulary.brands, "supplier": vocabulary.suppliers}[kind]
+    for size in (3, 2, 1):
+        for i in range(len(words) - size + 1):
+            canonical = index.exact(" ".join(words[i:i + size]))
+            if canonical:
+                return canonical
+    return None
+
+
+def predict(query: str, vocabulary: CatalogVocabulary) -> Tuple[str, dict]:
+    """Cheap keyword guess at the analyzer's (query_type, entities).
+
+    Entities are empty when nothing in the query matched the catalog.
+    """
+    text = query.lower()
+    words = re.findall(r"[a-z0-9]+", text)
+    entities = {}
+
+    between = _BETWEEN.search(text)
+    if between:
+        entities["min_price"], entities["max_price"] = float(between.group(1)), float(between.group(2))
+    else:
+        if _MAX_PRICE.search(text):
+            entities["max_price"] = float(_MAX_PRICE.search(text).group(1))
+        if _MIN_PRICE.search(text):
+            entities["min_price"] = float(_MIN_PRICE.search(text).group(1))
+
+    category = _find(vocabulary, "category", words)
+    brand = _find(vocabulary, "brand", words)
+    supplier = _find(vocabulary, "supplier", words)
+    if category:
+        entities["category"] = category
+    if brand:
+        entities["brand"] = brand
+    # The noun usually comes last: "wireless gaming mouse"
+    terms = [normalize(word) for word in words if normalize(word) in vocabulary.product_terms]
+    if terms:
+        entities["product_type"] = terms[-1]
+
+    if _STATS.search(text):
+        return "catalog_stats", entities
+    if supplier:
+        if re.search(r"\b(products?|items?|sells?|offer|catalog|from)\b", text):
+            return "supplier_products", {"supplier_name": supplier}
+        return "supplier_details", {"supplier_name": supplier}
+    if re.search(r"\b(suppliers?|vendors?|who sells)\b", text):
+        return "supplier_search", {"category": category} if category else {}
+    return "product_search", entities
+
+
+class SpeculationStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_total = 0.0
+
+    def record_start(self) -> None:
+        with self._lock:
+            self.started += 1
+
+    def record(self, hit: bool, saved: float = 0.0) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.saved_total += saved
+            else:
+                self.misses += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            resolved = self.hits + self.misses
+            return {
+                "started": self.started,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / resolved if resolved else 0,
+                "avg_saved_ms": 1000 * self.saved_total / self.hits if self.hits else 0,
+            }
+
+
+speculation_stats = SpeculationStats()
+
+
+class Speculation:
+    """A DB query started before the analyzer finished, keyed by its plan.
+
+    Each speculation is resolved exactly once, by `take` or `discard`.
+    """
+
+    def __init__(self, plan: Tuple, executor: Executor, fn: Callable[[dict], str], args: dict):
+        self.plan = plan
+        self.duration = None
+        self.resolved = False
+        self.future: Future = executor.submit(self._run, fn, args)
+        speculation_stats.record_start()
+
+    def _run(self, fn: Callable[[dict], str], args: dict) -> str:
+        start = time.perf_counter()
+        try:
+            return fn(args)
+        finally:
+            self.duration = time.perf_counter() - start
+
+    def take(self, plan: Tuple) -> Optional[str]:
+        """Return the prefetched result if it answers `plan`, else cancel it."""
+        if self.resolved:
+            return None
+        if plan != self.plan:
+            self.discard()
+            return None
+
+        self.resolved = True
+        waited = time.perf_counter()
+        try:
+            result = self.future.result()
+        except Exception as e:
+            logger.error(f"Speculative query failed: {str(e)}")
+            speculation_stats.record(hit=False)
+            return None
+        waited = time.perf_counter() - waited
+        # DB time that overlapped the analyzer call instead of following it
+        speculation_stats.record(hit=True, saved=max(0.0, (self.duration or 0) - waited))
+        return result
+
+    def discard(self) -> None:
+        if self.resolved:
+            return
+        self.resolved = True
+        self.future.cancel()
+        speculation_stats.record(hit=False)
@@ -0,0 +1,203 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.bulk import on_batch_written
+from app.db.database import get_db, get_read_db
+from app.models.product import Product
+from app.models.supplier import Supplier, SupplierCategory
+
+logger = logging.getLogger(__name__)
+
+_SUFFIXES = {"inc", "incorporated", "ltd", "llc", "co", "corp", "corporation", "company", "the"}
+
+
+def normalize(value: str) -> str:
+    """Lowercase, drop punctuation and company suffixes, and strip plurals."""
+    tokens = re.sub(r"[^a-z0-9]+", " ", str(value).lower()).split()
+    tokens = [t for t in tokens if t not in _SUFFIXES] or tokens
+    return " ".join(t[:-1] if len(t) > 3 and t.endswith("s") and not t.endswith("ss") else t for t in tokens)
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key.replace(' ', '')} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NGramIndex:
+    """Maps free-form text to one of a fixed set of canonical values.
+
+    Exact normalized matches win; otherwise candidates sharing trigrams are
+    ranked by Dice similarity and the best one above `threshold` is returned.
+    """
+
+    def __init__(self, values: Iterable[str], threshold: float = 0.5):
+        self.threshold = threshold
+        self._canonical: Dict[str, str] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, List[str]] = defaultdict(list)
+        for value in values:
+            if not value:
+                continue
+            key = normalize(value)
+            if key in self._canonical:
+                continue
+            self._canonical[key] = value
+            self._grams[key] = _trigrams(key)
+            for gram in self._grams[key]:
+                self._postings[gram].append(key)
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def keys(self) -> Iterable[str]:
+        return self._canonical.keys()
+
+    def exact(self, value: str) -> Optional[str]:
+        return self._canonical.get(normalize(value))
+
+    def lookup(self, value: str) -> Optional[str]:
+        if not value:
+            return None
+        key = normalize(value)
+        if key in self._canonical:
+            return self._canonical[key]
+
+        grams = _trigrams(key)
+        overlap = Counter()
+        for gram in grams:
+            overlap.update(self._postings.get(gram, ()))
+
+        best, best_score = None, self.threshold
+        for candidate, shared in overlap.items():
+            score = 2 * shared / (len(grams) + len(self._grams[candidate]))
+            if score > best_score:
+                best, best_score = candidate, score
+        return self._canonical[best] if best else None
+
+
+class CatalogVocabulary:
+    def __init__(
+        self,
+        categories: Iterable[str],
+        brands: Iterable[str],
+        suppliers: Dict[str, int],
+        product_names: Iterable[str] = (),
+    ):
+        self.categories = NGramIndex(categories)
+        self.brands = NGramIndex(brands)
+        self.suppliers = NGramIndex(suppliers)
+        self.supplier_ids = dict(suppliers)
+        # Normalized words of product names, minus category and brand words
+        taken = {word for index in (self.categories, self.brands) for key in index.keys() for word in key.split()}
+        self.product_terms = {word for name in product_names if name for word in normalize(name).split()} - taken
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def from_db(cls, db: Session) -> "CatalogVocabulary":
+        categories = set(db.execute(select(Product.category).distinct()).scalars())
+        categories.update(db.execute(select(SupplierCategory.category).distinct()).scalars())
+        brands = db.execute(select(Product.brand).distinct()).scalars().all()
+        suppliers = {name: id for id, name in db.execute(select(Supplier.id, Supplier.name).order_by(Supplier.id))
+                     if name}
+        names = db.execute(select(Product.name).distinct()).scalars().all()
+        return cls(categories, brands, suppliers, names)
+
+    def canonical(self, kind: str, value: str) -> Optional[str]:
+        index = {"category": self.categories, "brand": self.brands, "supplier": self.suppliers}[kind]
+        return index.lookup(value)
+
+    def supplier_id(self, name: str) -> Optional[int]:
+        canonical = self.suppliers.lookup(name)
+        return self.supplier_ids[canonical] if canonical else None
+
+
+_vocabulary: Optional[CatalogVocabulary] = None
+_stale = False
+_invalidated_at = float("-inf")
+_rebuilding = False
+_lock = threading.Lock()
+_first_build = threading.Lock()
+
+
+def _rebuild() -> None:
+    """Build a fresh vocabulary and swap it in, repeating while invalidations keep arriving."""
+    global _vocabulary, _stale, _rebuilding
+    while True:
+        # Let a burst of writes settle so it costs a single rebuild
+        delay = _invalidated_at + settings.VOCABULARY_DEBOUNCE_SECONDS - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+            continue
+        with _lock:
+            invalidated, _stale = _stale, False
+        # After an invalidation a replica may not have the new rows yet,
+        # and the result is cached for the whole TTL, so read the primary
+        db = next(get_db() if invalidated else get_read_db())
+        try:
+            vocabulary = CatalogVocabulary.from_db(db)
+        except Exception as e:
+            logger.error(f"Vocabulary rebuild failed: {str(e)}")
+            with _lock:
+                _stale = _stale or invalidated
+                _rebuilding = False
+            return
+        finally:
+            db.close()
+        with _lock:
+            _vocabulary = vocabulary
+            if not _stale:
+                _rebuilding = False
+                return
+
+
+def _schedule_rebuild() -> None:
+    global _rebuilding
+    with _lock:
+        if _rebuilding:
+            return
+        _rebuilding = True
+    threading.Thread(target=_rebuild, name="vocabulary-rebuild", daemon=True).start()
+
+
+def invalidate_vocabulary() -> None:
+    global _stale, _invalidated_at
+    with _lock:
+        _stale = True
+        _invalidated_at = time.monotonic()
+    _schedule_rebuild()
+
+
+def get_vocabulary() -> CatalogVocabulary:
+    """Return the shared vocabulary.
+
+    Only the very first call builds it inline. After that a stale or expired
+    vocabulary keeps being served while one background thread rebuilds it.
+    """
+    global _vocabulary
+    vocabulary = _vocabulary
+    if vocabulary is None:
+        with _first_build:
+            if _vocabulary is None:
+                db = next(get_db())
+                try:
+                    _vocabulary = CatalogVocabulary.from_db(db)
+                finally:
+                    db.close()
+            return _vocabulary
+
+    if _stale or time.monotonic() - vocabulary.built_at >= settings.VOCABULARY_TTL_SECONDS:
+        _schedule_rebuild()
+    return vocabulary
+
+
+@on_batch_written
+def _refresh_after_ingest(db: Session, table: str, rows: List[dict]) -> None:
+    invalidate_vocabulary()
@@ -14,6 +14,59 @@ class Settings(BaseSettings):
         os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
     )
 
+    # Chat rate limiting and admission control
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+    # Whether chat requests are let through (true) or rejected with 503
+    # (false) while the Redis rate limiter is unreachable
+    RATE_LIMIT_FAIL_OPEN: bool = os.getenv("RATE_LIMIT_FAIL_OPEN", "true").lower() == "true"
+    CHAT_RATE_LIMIT_PER_MINUTE: float = float(
+        os.getenv("CHAT_RATE_LIMIT_PER_MINUTE", "20")
+    )
+    CHAT_RATE_LIMIT_BURST: int = int(os.getenv("CHAT_RATE_LIMIT_BURST", "5"))
+    CHAT_MAX_CONCURRENCY: int = int(os.getenv("CHAT_MAX_CONCURRENCY", "8"))
+    CHAT_MAX_QUEUE: int = int(os.getenv("CHAT_MAX_QUEUE", "32"))
+    CHAT_QUEUE_TARGET_MS: int = int(os.getenv("CHAT_QUEUE_TARGET_MS", "2000"))
+
+    # Catalog vocabulary used to normalize analyzer entities
+    VOCABULARY_TTL_SECONDS: int = int(os.getenv("VOCABULARY_TTL_SECONDS", "300"))
+    # Catalog writes within this window of each other share one rebuild
+    VOCABULARY_DEBOUNCE_SECONDS: float = float(os.getenv("VOCABULARY_DEBOUNCE_SECONDS", "2"))
+
+    # Full rebuild of the supplier/price aggregates, repairing any drift
+    STATS_RECONCILE_SECONDS: int = int(os.getenv("STATS_RECONCILE_SECONDS", "3600"))
+
+    # Comma-separated read replica URLs; reads use the primary when empty
+    READ_REPLICA_URLS: Optional[str] = os.getenv("READ_REPLICA_URLS")
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_HEALTH_CHECK_SECONDS: float = float(
+        os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "10")
+    )
+
+    # Micro-batching of analyzer LLM calls across concurrent requests
+    ANALYZER_BATCH_ENABLED: bool = os.getenv("ANALYZER_BATCH_ENABLED", "false").lower() == "true"
+    ANALYZER_BATCH_WINDOW_MS: int = int(os.getenv("ANALYZER_BATCH_WINDOW_MS", "20"))
+    ANALYZER_BATCH_MAX_SIZE: int = int(os.getenv("ANALYZER_BATCH_MAX_SIZE", "8"))
+
+    # Comma-separated analyzer model ladder, cheapest first
+    ANALYZER_MODELS: str = os.getenv("ANALYZER_MODELS", "llama-3.1-8b-instant,mixtral-8x7b-32768")
+    ANALYZER_MIN_CONFIDENCE: float = float(os.getenv("ANALYZER_MIN_CONFIDENCE", "0.7"))
+
+    # Heuristic DB prefetch started alongside the analyzer call; off until
+    # its hit rate (see /chatbot/metrics) is known for real traffic
+    SPECULATION_ENABLED: bool = os.getenv("SPECULATION_ENABLED", "false").lower() == "true"
+    SPECULATION_WORKERS: int = int(os.getenv("SPECULATION_WORKERS", "4"))
+
+    # Chat turns older than this many days (rounded down to whole months) are
+    # moved to compressed archive files; 0 keeps everything in chat_history
+    CHAT_RETENTION_DAYS: int = int(os.getenv("CHAT_RETENTION_DAYS", "0"))
+    # Absolute path on storage every app host can read, e.g. a shared volume;
+    # archiving refuses to run until it is set, since rows it moves are deleted
+    CHAT_ARCHIVE_DIR: str = os.getenv("CHAT_ARCHIVE_DIR", "")
+    CHAT_MAINTENANCE_INTERVAL_SECONDS: int = int(
+        os.getenv("CHAT_MAINTENANCE_INTERVAL_SECONDS", "3600")
+    )
+
     class Config:
         case_sensitive = True
 
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryRateLimiter:
+    """Per-process token buckets keyed by user.
+
+    A bucket idle long enough to refill completely is the same as no bucket,
+    so those are swept out once per refill period to keep memory bounded by
+    recently active users.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.burst = burst
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._refill_time = burst / rate_per_second
+        self._swept_at = time.monotonic()
+
+    def _sweep(self, now: float) -> None:
+        self._buckets = {
+            key: (tokens, last) for key, (tokens, last) in self._buckets.items()
+            if now - last < self._refill_time
+        }
+        self._swept_at = now
+
+    async def acquire(self, key: str) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._swept_at >= self._refill_time:
+                self._sweep(now)
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return True, 0.0
+            self._buckets[key] = (tokens, now)
+            return False, (1 - tokens) / self.rate
+
+
+class RedisRateLimiter:
+    """Token buckets shared by every worker through Redis.
+
+    The refill and take happen in one Lua script using the Redis clock, so
+    concurrent workers never double-spend a token.
+    """
+
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(data[1]) or burst
+    local ts = tonumber(data[2]) or now
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    local allowed = 0
+    local retry = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        retry = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(retry)}
+    """
+
+    def __init__(
+        self,
+        url: str,
+        rate_per_second: float,
+        burst: int,
+        fail_open: bool = True,
+        prefix: str = "ratelimit:chat:",
+    ):
+        import redis.asyncio
+
+        self.rate = rate_per_second
+        self.burst = burst
+        self.fail_open = fail_open
+        self.prefix = prefix
+        self._client = redis.asyncio.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def acquire(self, key: str) -> Tuple[bool, float]:
+        try:
+            allowed, retry = await self._script(keys=[self.prefix + key], args=[self.rate, self.burst])
+        except Exception as e:
+            if self.fail_open:
+                logger.warning(f"Rate limiter unavailable, allowing request: {str(e)}")
+                return True, 0.0
+            logger.error(f"Rate limiter unavailable, rejecting request: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Rate limiter unavailable, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        return bool(allowed), float(retry)
+
+
+class AdmissionController:
+    """Caps in-flight LLM calls and sheds load when the wait queue backs up.
+
+    Requests beyond `max_concurrency` wait in a bounded queue; they are
+    rejected immediately when the queue is full and rejected after
+    `target_wait` seconds if no slot frees up. Limits are per worker process.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, target_wait: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.target_wait = target_wait
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._avg_service = 1.0
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self._avg_service * (self._waiting + 1) / self.max_concurrency))
+
+    def _overloaded(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Chat service is overloaded, please retry shortly",
+            headers={"Retry-After": str(self.retry_after())},
+        )
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            raise self._overloaded()
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.target_wait)
+        except asyncio.TimeoutError:
+            raise self._overloaded()
+        finally:
+            self._waiting -= 1
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+            self._avg_service = 0.8 * self._avg_service + 0.2 * (time.monotonic() - start)
+
+
+def build_rate_limiter():
+    rate = settings.CHAT_RATE_LIMIT_PER_MINUTE / 60
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimiter(
+            settings.REDIS_URL, rate, settings.CHAT_RATE_LIMIT_BURST, settings.RATE_LIMIT_FAIL_OPEN
+        )
+    return MemoryRateLimiter(rate, settings.CHAT_RATE_LIMIT_BURST)
+
+
+chat_rate_limiter = build_rate_limiter()
+chat_admission = AdmissionController(
+    settings.CHAT_MAX_CONCURRENCY,
+    settings.CHAT_MAX_QUEUE,
+    settings.CHAT_QUEUE_TARGET_MS / 1000,
+)
+
+
+async def check_rate_limit(user_id) -> None:
+    allowed, retry_after = await chat_rate_limiter.acquire(str(user_id))
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
@@ -0,0 +1,22 @@
+from typing import Any, List
+
+import orjson
+from sqlalchemy.orm import Session
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj)
+
+
+def dumps_str(obj: Any) -> str:
+    return orjson.dumps(obj).decode()
+
+
+def fetch_rows(db: Session, stmt) -> List[dict]:
+    """Execute a column select and build plain dicts from the raw row tuples.
+
+    Avoids hydrating ORM objects when the rows are only going to be encoded.
+    """
+    result = db.execute(stmt)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
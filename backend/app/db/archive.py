@@ -0,0 +1,184 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from pathlib import Path
+from typing import List, Optional
+
+import orjson
+import zstandard
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.partitions import expired_partitions, maintain_chat_partitions, month_start
+from app.models.chat import ArchivedChat, ChatHistory
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_LEVEL = 9
+# Keeps concurrent workers from archiving the same rows twice on Postgres
+ARCHIVE_LOCK_ID = 0x63686174
+
+CHAT_COLUMNS = (
+    ChatHistory.id, ChatHistory.chat_id, ChatHistory.user_id, ChatHistory.title,
+    ChatHistory.user_message, ChatHistory.bot_response, ChatHistory.timestamp
+)
+
+
+def archive_path(archive_dir: str, user_id: int, month: str) -> Path:
+    return Path(archive_dir) / str(user_id) / f"{month}.ndjson.zst"
+
+
+def read_archive(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    data = zstandard.ZstdDecompressor().decompress(path.read_bytes())
+    return [orjson.loads(line) for line in data.splitlines() if line]
+
+
+def write_archive(path: Path, turns: List[dict]) -> List[dict]:
+    """Merge `turns` into the archive at `path` and return its full contents.
+
+    Turns already in the file are replaced by id, so re-running an archive
+    pass that died before deleting the hot rows is harmless.
+    """
+    merged = {turn["id"]: turn for turn in read_archive(path)}
+    # Round-trip so new turns carry the same ISO timestamp strings as stored ones
+    merged.update((turn["id"], orjson.loads(orjson.dumps(turn))) for turn in turns)
+    rows = sorted(merged.values(), key=lambda turn: (turn["timestamp"], turn["id"]))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(
+        b"\n".join(orjson.dumps(row) for row in rows)
+    ))
+    os.replace(tmp, path)
+    return rows
+
+
+def _user_month(row) -> tuple:
+    return row["user_id"], row["timestamp"].strftime("%Y-%m")
+
+
+def _index_entry(db: Session, user_id: int, chat_id: str, month: str, turns: List[dict]) -> ArchivedChat:
+    """archived_chats row for one chat and month, carrying its latest turn for /history.
+
+    Only a chat's first turn has a title, so later months reuse the one
+    already recorded for an earlier month.
+    """
+    title = next((t["title"] for t in turns if t["title"]), None) or db.execute(
+        select(ArchivedChat.title).where(
+            ArchivedChat.user_id == user_id, ArchivedChat.chat_id == chat_id, ArchivedChat.title.isnot(None)
+        ).limit(1)
+    ).scalar()
+    last = turns[-1]
+    return ArchivedChat(
+        user_id=user_id,
+        chat_id=chat_id,
+        month=month,
+        turns=len(turns),
+        title=title,
+        user_message=last["user_message"],
+        bot_response=last["bot_response"],
+        timestamp=datetime.fromisoformat(last["timestamp"]),
+        messages="\n".join(t["user_message"] or "" for t in turns),
+    )
+
+
+def archive_expired_chats(
+    db: Session,
+    retention_days: int,
+    archive_dir: str,
+    now: Optional[datetime] = None,
+) -> int:
+    """Move whole months of turns older than the retention window to archive files.
+
+    Writes one zstd-compressed NDJSON file per user and month, records the
+    archived chats in `archived_chats`, then removes the hot rows (dropping
+    expired partitions outright on Postgres). Returns the number of turns moved.
+
+    `archive_dir` must be absolute: the hot rows are gone afterwards, so the
+    files have to live somewhere every host serving /history can read.
+    """
+    if not os.path.isabs(archive_dir):
+        raise ValueError(f"Chat archive directory must be an absolute, shared path, got {archive_dir!r}")
+    cutoff = month_start((now or datetime.now(timezone.utc)) - timedelta(days=retention_days))
+    cutoff_at = datetime(cutoff.year, cutoff.month, 1, tzinfo=timezone.utc)
+    postgres = db.get_bind().dialect.name == "postgresql"
+    if postgres and not db.execute(text(f"SELECT pg_try_advisory_xact_lock({ARCHIVE_LOCK_ID})")).scalar():
+        return 0
+
+    stmt = select(*CHAT_COLUMNS).where(ChatHistory.timestamp < cutoff_at).order_by(
+        ChatHistory.user_id, ChatHistory.timestamp, ChatHistory.id
+    )
+    rows = db.execute(stmt.execution_options(yield_per=1000)).mappings()
+
+    archived = 0
+    for (user_id, month), group in groupby(rows, key=_user_month):
+        turns = [dict(row) for row in group]
+        stored = write_archive(archive_path(archive_dir, user_id, month), turns)
+        for chat_id in {turn["chat_id"] for turn in turns}:
+            db.merge(_index_entry(db, user_id, chat_id, month, [t for t in stored if t["chat_id"] == chat_id]))
+        # Months are visited oldest first; make this one's titles visible to the next
+        db.flush()
+        archived += len(turns)
+
+    if not archived:
+        db.rollback()
+        return 0
+
+    if postgres:
+        for name, _ in expired_partitions(db.connection(), cutoff):
+            db.execute(text(f"DROP TABLE {name}"))
+    # Anything left, e.g. rows in the default partition
+    db.execute(delete(ChatHistory).where(ChatHistory.timestamp < cutoff_at))
+    db.commit()
+    logger.info(f"Archived {archived} chat turns older than {cutoff.isoformat()}")
+    return archived
+
+
+def load_archived_turns(db: Session, user_id: int, chat_id: str, archive_dir: Optional[str] = None) -> List[dict]:
+    """Read a chat's archived turns back from its monthly archive files."""
+    months = db.execute(
+        select(ArchivedChat.month).where(ArchivedChat.user_id == user_id, ArchivedChat.chat_id == chat_id)
+    ).scalars().all()
+
+    turns = []
+    for month in months:
+        path = archive_path(archive_dir or settings.CHAT_ARCHIVE_DIR, user_id, month)
+        turns.extend(turn for turn in read_archive(path) if turn["chat_id"] == chat_id)
+    return turns
+
+
+def run_chat_maintenance() -> int:
+    with SessionLocal() as db:
+        maintain_chat_partitions(db.connection())
+        db.commit()
+        if settings.CHAT_RETENTION_DAYS <= 0:
+            return 0
+        return archive_expired_chats(db, settings.CHAT_RETENTION_DAYS, settings.CHAT_ARCHIVE_DIR)
+
+
+def _maintenance_loop() -> None:
+    while True:
+        try:
+            run_chat_maintenance()
+        except Exception as e:
+            logger.error(f"Chat maintenance failed: {str(e)}")
+        time.sleep(settings.CHAT_MAINTENANCE_INTERVAL_SECONDS)
+
+
+def start_chat_maintenance() -> threading.Thread:
+    """Create upcoming partitions and archive expired turns in the background."""
+    thread = threading.Thread(target=_maintenance_loop, name="chat-maintenance", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Archived {run_chat_maintenance()} chat turns")
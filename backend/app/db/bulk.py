@@ -0,0 +1,320 @@
+import csv
+import io
+import json
+import logging
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, List, Tuple, Type
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+BACKFILL_LOCK_ID = 0x63617473
+
+PRODUCT_COLUMNS = ["name", "brand", "price", "category", "description", "supplier_id"]
+SUPPLIER_COLUMNS = ["name", "email", "phone", "address", "categories_offered"]
+
+# Called once per ingest batch (not per row) with the table name, the
+# validated rows that were written and the previous version of any row they
+# replaced, so caches and derived indexes can refresh the keys they touched.
+_batch_listeners: List[Callable[[Session, str, List[dict]], None]] = []
+
+
+def on_batch_written(listener: Callable[[Session, str, List[dict]], None]):
+    _batch_listeners.append(listener)
+    return listener
+
+
+def notify_batch_written(db: Session, table: str, rows: List[dict]) -> None:
+    for listener in _batch_listeners:
+        try:
+            listener(db, table, rows)
+        except Exception as e:
+            logger.error(f"Batch listener {listener.__name__} failed for {table}: {str(e)}")
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+async def iter_records(stream: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, dict]]:
+    """Yield (line_number, raw_record) pairs from an NDJSON or CSV body.
+
+    CSV input must carry a header row. Quoted fields may span lines; the
+    line number is the record's first line.
+    """
+    if fmt == "csv":
+        async for record in _iter_csv_records(stream):
+            yield record
+        return
+
+    line_no = 0
+    async for line in iter_lines(stream):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, {"__error__": f"Invalid JSON: {e.msg}"}
+
+
+async def _iter_csv_records(stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, dict]]:
+    # One reader over all lines so quoting carries across line breaks. Lines
+    # are only handed to it once they hold a whole record (balanced quotes),
+    # so it never asks for input the stream hasn't delivered yet.
+    lines = deque()
+    reader = csv.reader(iter(lines.popleft, None))
+    header = None
+    line_no = first_line = 0
+    quotes = 0
+    async for line in iter_lines(stream):
+        line_no += 1
+        if not lines:
+            if not line.strip():
+                continue
+            first_line = line_no
+        lines.append(line + "\n")
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+
+        values = next(reader)
+        quotes = 0
+        if header is None:
+            header = [h.strip() for h in values]
+        elif len(values) != len(header):
+            yield first_line, {"__error__": f"Expected {len(header)} columns, got {len(values)}"}
+        else:
+            yield first_line, dict(zip(header, values))
+
+    if lines:
+        yield first_line, {"__error__": "Unterminated quoted field"}
+
+
+def _coerce_supplier_csv(record: dict) -> dict:
+    categories = record.get("categories_offered")
+    if isinstance(categories, str):
+        categories = categories.strip()
+        if categories.startswith("["):
+            record["categories_offered"] = json.loads(categories)
+        else:
+            record["categories_offered"] = [c.strip() for c in categories.split(";") if c.strip()]
+    return record
+
+
+def validate_chunk(schema: Type[BaseModel], records: List[Tuple[int, dict]]) -> Tuple[List[dict], List[dict]]:
+    rows, errors = [], []
+    for line_no, record in records:
+        if not isinstance(record, dict):
+            errors.append({"line": line_no, "error": "Record must be an object"})
+            continue
+        if "__error__" in record:
+            errors.append({"line": line_no, "error": record["__error__"]})
+            continue
+        try:
+            if "categories_offered" in schema.model_fields:
+                record = _coerce_supplier_csv(record)
+            rows.append(schema(**record).model_dump())
+        except (ValidationError, ValueError) as e:
+            errors.append({"line": line_no, "error": str(e)})
+    return rows, errors
+
+
+def _load_staging(db: Session, staging: str, columns: List[str], rows: List[dict]) -> None:
+    if db.bind.dialect.name == "postgresql":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow([row[c] for c in columns])
+        buf.seek(0)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {staging} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf
+            )
+        finally:
+            cursor.close()
+    else:
+        placeholders = ", ".join(f":{c}" for c in columns)
+        db.execute(
+            text(f"INSERT INTO {staging} ({', '.join(columns)}) VALUES ({placeholders})"),
+            rows,
+        )
+
+
+def _upsert(db: Session, table: str, columns: List[str], keys: List[str], rows: List[dict]) -> Tuple[int, int, List[dict]]:
+    staging = f"_stage_{table}"
+    db.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS {staging} AS "
+        f"SELECT {', '.join(columns)} FROM {table} WHERE 1 = 0"
+    ))
+    db.execute(text(f"DELETE FROM {staging}"))
+    _load_staging(db, staging, columns, rows)
+
+    match = " AND ".join(f"{table}.{k} = s.{k}" for k in keys)
+    previous = [dict(row._mapping) for row in db.execute(text(
+        f"SELECT {', '.join(f'{table}.{c}' for c in columns)} FROM {table} JOIN {staging} s ON {match}"
+    ))]
+    if db.bind.dialect.name in ("postgresql", "sqlite"):
+        # A single statement against the unique key, so concurrent or retried
+        # ingests of the same feed update rows instead of inserting twice.
+        # `WHERE true` keeps SQLite from reading ON CONFLICT as a join clause.
+        assignments = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in keys)
+        written = db.execute(text(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT {', '.join('s.' + c for c in columns)} FROM {staging} s WHERE true "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {assignments}"
+        )).rowcount
+        return written - len(previous), len(previous), previous
+
+    assignments = ", ".join(f"{c} = s.{c}" for c in columns if c not in keys)
+    updated = db.execute(text(
+        f"UPDATE {table} SET {assignments} FROM {staging} s WHERE {match}"
+    )).rowcount
+    inserted = db.execute(text(
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"SELECT {', '.join('s.' + c for c in columns)} FROM {staging} s "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {match})"
+    )).rowcount
+    return inserted, updated, previous
+
+
+def _dedupe(rows: List[dict], keys: List[str]) -> List[dict]:
+    latest = {}
+    for row in rows:
+        latest[tuple(row[k] for k in keys)] = row
+    return list(latest.values())
+
+
+def upsert_products(db: Session, rows: List[dict]) -> Tuple[int, int, List[dict]]:
+    return _upsert(db, "products", PRODUCT_COLUMNS, ["supplier_id", "name"],
+                   _dedupe(rows, ["supplier_id", "name"]))
+
+
+def upsert_suppliers(db: Session, rows: List[dict]) -> Tuple[int, int, List[dict]]:
+    rows = _dedupe(rows, ["email"])
+    result = _upsert(db, "suppliers", SUPPLIER_COLUMNS, ["email"], [
+        {**row, "categories_offered": json.dumps(row["categories_offered"])} for row in rows
+    ])
+
+    ids = dict(db.execute(text(
+        "SELECT s.email, s.id FROM suppliers s JOIN _stage_suppliers st ON st.email = s.email"
+    )).all())
+    sync_supplier_categories(db, {ids[row["email"]]: row["categories_offered"] for row in rows})
+    return result
+
+
+def sync_supplier_categories(db: Session, categories_by_supplier: Dict[int, List[str]]) -> None:
+    """Rewrite the supplier_categories rows for the given suppliers."""
+    if not categories_by_supplier:
+        return
+    supplier_ids = list(categories_by_supplier)
+    for i in range(0, len(supplier_ids), 500):
+        db.execute(
+            text("DELETE FROM supplier_categories WHERE supplier_id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": supplier_ids[i:i + 500]},
+        )
+    pairs = [
+        {"category": category, "supplier_id": supplier_id}
+        for supplier_id, categories in categories_by_supplier.items()
+        for category in dict.fromkeys(categories or [])
+    ]
+    if pairs:
+        # Tolerate a concurrent sync of the same supplier having inserted first
+        on_conflict = " ON CONFLICT DO NOTHING" if db.bind.dialect.name in ("postgresql", "sqlite") else ""
+        db.execute(
+            text(f"INSERT INTO supplier_categories (category, supplier_id) VALUES (:category, :supplier_id){on_conflict}"),
+            pairs,
+        )
+
+
+def backfill_supplier_categories(db: Session) -> None:
+    """Populate supplier_categories from categories_offered on first run.
+
+    Every worker calls this on startup; on Postgres they take turns, and the
+    ones that follow find the table populated.
+    """
+    if db.bind.dialect.name == "postgresql":
+        db.execute(text(f"SELECT pg_advisory_xact_lock({BACKFILL_LOCK_ID})"))
+    if db.execute(text("SELECT 1 FROM supplier_categories LIMIT 1")).first():
+        db.commit()
+        return
+    rows = db.execute(text("SELECT id, categories_offered FROM suppliers")).all()
+    sync_supplier_categories(db, {
+        id: json.loads(categories) if isinstance(categories, str) else categories
+        for id, categories in rows
+    })
+    db.commit()
+
+
+async def bulk_ingest(
+    db: Session,
+    stream: AsyncIterator[bytes],
+    fmt: str,
+    schema: Type[BaseModel],
+    table: str,
+    writer: Callable[[Session, List[dict]], Tuple[int, int, List[dict]]],
+    chunk_size: int = CHUNK_SIZE,
+) -> Dict:
+    summary = {"inserted": 0, "updated": 0, "failed": 0, "chunks": []}
+    written: List[dict] = []
+
+    # Validation and the database writes are blocking; each chunk runs in the
+    # threadpool so the event loop keeps serving other requests meanwhile.
+
+    def flush(records: List[Tuple[int, dict]]) -> None:
+        rows, errors = validate_chunk(schema, records)
+        report = {
+            "first_line": records[0][0],
+            "last_line": records[-1][0],
+            "inserted": 0,
+            "updated": 0,
+            "errors": errors,
+        }
+        failed = len(errors)
+        if rows:
+            try:
+                report["inserted"], report["updated"], previous = writer(db, rows)
+                db.commit()
+                written.extend(rows)
+                written.extend(previous)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Bulk {table} chunk failed: {str(e)}")
+                errors.append({"line": None, "error": str(e)})
+                failed += len(rows)
+        summary["inserted"] += report["inserted"]
+        summary["updated"] += report["updated"]
+        summary["failed"] += failed
+        summary["chunks"].append(report)
+
+    pending: List[Tuple[int, dict]] = []
+    async for record in iter_records(stream, fmt):
+        pending.append(record)
+        if len(pending) >= chunk_size:
+            await run_in_threadpool(flush, pending)
+            pending = []
+    if pending:
+        await run_in_threadpool(flush, pending)
+
+    if written:
+        await run_in_threadpool(notify_batch_written, db, table, written)
+    return summary
+
+
+def detect_format(content_type: str) -> str:
+    return "csv" if "csv" in (content_type or "") else "ndjson"
@@ -0,0 +1,170 @@
+import logging
+import re
+from typing import List
+
+from sqlalchemy import desc, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.serialization import fetch_rows
+from app.models.chat import ArchivedChat, ChatHistory
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX = "ix_chat_history_search_vector"
+
+# Title matches count double in ranking on both backends
+_PG_SEARCH_COLUMN = (
+    "ALTER TABLE chat_history ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(user_message, '')), 'B')"
+    ") STORED"
+)
+
+_SQLITE_SETUP = [
+    "CREATE VIRTUAL TABLE chat_history_fts USING fts5("
+    "title, user_message, content='chat_history', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER chat_history_fts_insert AFTER INSERT ON chat_history BEGIN "
+    "INSERT INTO chat_history_fts(rowid, title, user_message) "
+    "VALUES (new.id, new.title, new.user_message); END",
+    "CREATE TRIGGER chat_history_fts_delete AFTER DELETE ON chat_history BEGIN "
+    "INSERT INTO chat_history_fts(chat_history_fts, rowid, title, user_message) "
+    "VALUES ('delete', old.id, old.title, old.user_message); END",
+    "CREATE TRIGGER chat_history_fts_update AFTER UPDATE OF title, user_message ON chat_history BEGIN "
+    "INSERT INTO chat_history_fts(chat_history_fts, rowid, title, user_message) "
+    "VALUES ('delete', old.id, old.title, old.user_message); "
+    "INSERT INTO chat_history_fts(rowid, title, user_message) "
+    "VALUES (new.id, new.title, new.user_message); END",
+    # Index the rows that predate the table
+    "INSERT INTO chat_history_fts(chat_history_fts) VALUES ('rebuild')",
+]
+
+
+def _has_search_column(conn: Connection) -> bool:
+    return bool(conn.execute(text(
+        "SELECT 1 FROM information_schema.columns WHERE table_schema = current_schema() "
+        "AND table_name = 'chat_history' AND column_name = 'search_vector'"
+    )).first())
+
+
+def setup_chat_search(conn: Connection, concurrently: bool = False) -> None:
+    """Create the full-text index over chat titles and user messages.
+
+    Postgres gets a generated tsvector column with a GIN index; SQLite gets an
+    FTS5 table kept in sync by triggers. Both are skipped when already there.
+
+    On Postgres adding the column rewrites chat_history under an exclusive
+    lock, so an existing table is set up by `python -m app.db.migrations`
+    (which passes `concurrently` on an autocommit connection), never on startup.
+    """
+    if conn.dialect.name == "postgresql":
+        if not _has_search_column(conn):
+            conn.execute(text(_PG_SEARCH_COLUMN))
+        conn.execute(text(
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {SEARCH_INDEX} "
+            "ON chat_history USING GIN (search_vector)"
+        ))
+    elif conn.dialect.name == "sqlite":
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_history_fts'"
+        )).first()
+        if not exists:
+            for statement in _SQLITE_SETUP:
+                conn.execute(text(statement))
+
+
+def chat_search_ready(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return True
+    return _has_search_column(conn) and bool(conn.execute(text(
+        "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+    ), {"name": SEARCH_INDEX}).scalar())
+
+
+def check_chat_search(conn: Connection) -> None:
+    """Startup step: set up SQLite's FTS table, only report a missing Postgres index."""
+    if conn.dialect.name != "postgresql":
+        setup_chat_search(conn)
+    elif not chat_search_ready(conn):
+        logger.warning("Chat search index is missing; run `python -m app.db.migrations`")
+
+
+def search_chat_history(db: Session, user_id: int, query: str, limit: int, offset: int) -> List[dict]:
+    """Rank one user's chat turns against `query`, best match first.
+
+    Turns still in chat_history come first, ranked by the full-text index;
+    chats whose turns were archived by retention follow, newest first.
+    Returns turn metadata only; bot responses are left for `get_chat_messages`.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return []
+
+    # Live and archived matches form one list, so both are read from the start
+    wanted = offset + limit
+    rows = _search_live(db, user_id, query, words, wanted)
+    if len(rows) < wanted:
+        rows += _search_archived(db, user_id, words, wanted - len(rows))
+    return rows[offset:wanted]
+
+
+def _search_live(db: Session, user_id: int, query: str, words: List[str], limit: int) -> List[dict]:
+    dialect = db.get_bind().dialect.name
+    params = {"user_id": user_id, "limit": limit}
+    if dialect == "postgresql":
+        return fetch_rows(db, text(
+            "SELECT id, chat_id, title, user_message, timestamp, "
+            "ts_rank(search_vector, query) AS rank "
+            "FROM chat_history, websearch_to_tsquery('english', :query) query "
+            "WHERE user_id = :user_id AND search_vector @@ query "
+            "ORDER BY rank DESC, timestamp DESC LIMIT :limit"
+        ).bindparams(query=query, **params))
+
+    if dialect == "sqlite":
+        # Quote every term so user input can't use FTS5 query syntax
+        match = " ".join(f'"{word}"' for word in words)
+        return fetch_rows(db, text(
+            "SELECT c.id, c.chat_id, c.title, c.user_message, c.timestamp, "
+            "-bm25(chat_history_fts, 2.0, 1.0) AS rank "
+            "FROM chat_history_fts JOIN chat_history c ON c.id = chat_history_fts.rowid "
+            "WHERE chat_history_fts MATCH :match AND c.user_id = :user_id "
+            "ORDER BY rank DESC, c.timestamp DESC LIMIT :limit"
+        ).bindparams(match=match, **params))
+
+    # No full-text support: every term must appear somewhere, newest first
+    stmt = select(
+        ChatHistory.id, ChatHistory.chat_id, ChatHistory.title,
+        ChatHistory.user_message, ChatHistory.timestamp
+    ).where(ChatHistory.user_id == user_id)
+    for word in words:
+        stmt = stmt.where(or_(ChatHistory.title.ilike(f"%{word}%"), ChatHistory.user_message.ilike(f"%{word}%")))
+    stmt = stmt.order_by(desc(ChatHistory.timestamp)).limit(limit)
+    return [dict(row, rank=None) for row in fetch_rows(db, stmt)]
+
+
+def _search_archived(db: Session, user_id: int, words: List[str], limit: int) -> List[dict]:
+    """Archived chats whose title or messages contain every word.
+
+    One user has a row per chat and month at most, read through the primary
+    key, so a substring scan is enough here.
+    """
+    stmt = select(
+        ArchivedChat.chat_id, ArchivedChat.title, ArchivedChat.user_message,
+        ArchivedChat.messages, ArchivedChat.timestamp
+    ).where(ArchivedChat.user_id == user_id)
+    for word in words:
+        stmt = stmt.where(or_(ArchivedChat.title.ilike(f"%{word}%"), ArchivedChat.messages.ilike(f"%{word}%")))
+    stmt = stmt.order_by(desc(ArchivedChat.timestamp)).limit(limit)
+
+    lowered = [word.lower() for word in words]
+    results = []
+    for row in fetch_rows(db, stmt):
+        # Show the message that matched rather than the month's last one
+        matched = next(
+            (m for m in (row["messages"] or "").split("\n") if any(w in m.lower() for w in lowered)),
+            row["user_message"],
+        )
+        results.append({"id": None, "chat_id": row["chat_id"], "title": row["title"],
+                        "user_message": matched, "timestamp": row["timestamp"], "rank": None})
+    return results
@@ -1,16 +1,151 @@
-from sqlalchemy import create_engine
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def replication_lag(conn: Connection) -> float:
+    """Seconds the replica is behind its primary; 0 where there is no notion of lag.
+
+    A replica whose WAL receiver is not running reports infinite lag: it has
+    replayed everything it received, but has no way of knowing how far the
+    primary has moved on since.
+    """
+    if conn.dialect.name != "postgresql":
+        return 0.0
+    in_recovery, receiving, replayed_all, behind = conn.execute(text(
+        "SELECT pg_is_in_recovery(), "
+        "EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE pid IS NOT NULL), "
+        "pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(), "
+        "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+    )).first()
+    if not in_recovery:
+        return 0.0
+    if not receiving:
+        return float("inf")
+    # The last replayed transaction only dates the replica when WAL is still
+    # pending; with nothing to replay it is caught up however old that is.
+    if replayed_all:
+        return 0.0
+    return float(behind or 0)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(url, pool_pre_ping=True)
+        self.healthy = False
+        self.lag = 0.0
+        self.checked_at = float("-inf")
+
+
+class ReplicaRouter:
+    """Round-robins read-only sessions over healthy, caught-up replicas.
+
+    Replicas are probed every `check_interval` seconds by a background thread
+    (see `start`), never on the request path. A replica that failed its last
+    probe, has not been probed yet, or lags more than `max_lag` seconds is
+    skipped, and when no replica qualifies reads fall back to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replica_urls: List[str],
+        max_lag: float,
+        check_interval: float,
+        lag_probe: Callable[[Connection], float] = replication_lag,
+    ):
+        self.primary = primary
+        self.replicas = [Replica(url) for url in replica_urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self._cycle = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def check(self, replica: Replica) -> None:
+        try:
+            with replica.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                replica.lag = self.lag_probe(conn)
+            replica.healthy = True
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(f"Read replica {replica.engine.url!r} failed health check: {str(e)}")
+            replica.healthy = False
+        replica.checked_at = time.monotonic()
+
+    def check_all(self) -> None:
+        for replica in self.replicas:
+            self.check(replica)
+
+    def _probe_loop(self) -> None:
+        while True:
+            self.check_all()
+            if self._stop.wait(self.check_interval):
+                return
+
+    def start(self) -> None:
+        if self.replicas:
+            threading.Thread(target=self._probe_loop, name="replica-probe", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _usable(self, replica: Replica) -> bool:
+        return replica.healthy and replica.lag <= self.max_lag
+
+    def read_engine(self) -> Engine:
+        if not self.replicas:
+            return self.primary
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                replica = self.replicas[next(self._cycle)]
+            if self._usable(replica):
+                return replica.engine
+        return self.primary
+
+
+replica_router = ReplicaRouter(
+    engine,
+    [url.strip() for url in (settings.READ_REPLICA_URLS or "").split(",") if url.strip()],
+    settings.REPLICA_MAX_LAG_SECONDS,
+    settings.REPLICA_HEALTH_CHECK_SECONDS,
+)
+replica_router.start()
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Session for read-only work; routed to a replica when one is usable.
+
+    Anything that must see its own writes (chat history, post-write reads)
+    should keep using `get_db`.
+    """
+    db = SessionLocal(bind=replica_router.read_engine())
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,134 @@
+import logging
+from typing import Callable, List, NamedTuple, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.chat_search import SEARCH_INDEX, setup_chat_search
+from app.db.partitions import is_partitioned
+
+logger = logging.getLogger(__name__)
+
+
+class IndexSpec(NamedTuple):
+    name: str
+    table: str
+    columns: str
+    unique: bool = False
+    # Run before building the index, e.g. to clear rows a unique index would reject
+    prepare: Optional[Callable[[Connection], None]] = None
+
+
+def _drop_duplicate_products(conn: Connection) -> None:
+    # Left behind by concurrent ingests before (supplier_id, name) was unique;
+    # the newest row is the one the bulk upsert would have kept
+    removed = conn.execute(text(
+        "DELETE FROM products WHERE supplier_id IS NOT NULL AND name IS NOT NULL "
+        "AND id NOT IN (SELECT max(id) FROM products WHERE supplier_id IS NOT NULL "
+        "AND name IS NOT NULL GROUP BY supplier_id, name)"
+    )).rowcount
+    if removed:
+        logger.warning(f"Removed {removed} duplicate products before adding uq_products_supplier_id_name")
+
+
+# Indexes declared on the models. create_all only builds them with a new
+# table, so databases created before they were added need this step.
+INDEXES = [
+    IndexSpec("uq_products_supplier_id_name", "products", "supplier_id, name", unique=True,
+              prepare=_drop_duplicate_products),
+    # Price range filters on product listings
+    IndexSpec("ix_products_price", "products", "price"),
+    # Scopes history and search queries to one user's turns
+    IndexSpec("ix_chat_history_user_id_timestamp", "chat_history", "user_id, timestamp"),
+]
+
+# Superseded by an entry in INDEXES; dropped once that one exists
+OBSOLETE_INDEXES = ["ix_products_supplier_id_name"]
+
+
+def _index_state(conn: Connection, name: str):
+    """True if the index exists and is usable, False if a failed build left it invalid, else None."""
+    if conn.dialect.name == "postgresql":
+        return conn.execute(text(
+            "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+        ), {"name": name}).scalar()
+    if conn.dialect.name == "sqlite":
+        return conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"
+        ), {"name": name}).scalar() and True
+    return True
+
+
+def missing_indexes(conn: Connection) -> List[IndexSpec]:
+    # A table that does not exist yet gets its indexes from create_all
+    tables = set(inspect(conn).get_table_names())
+    return [spec for spec in INDEXES if spec.table in tables and not _index_state(conn, spec.name)]
+
+
+def create_indexes(engine: Engine) -> List[str]:
+    """Build every missing index in INDEXES; returns the names created.
+
+    On Postgres the builds run CONCURRENTLY, outside a transaction, so
+    writes to the table carry on meanwhile.
+    """
+    postgres = engine.dialect.name == "postgresql"
+    created = []
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        for spec in missing_indexes(conn):
+            state = _index_state(conn, spec.name)
+            if state is False:
+                # An interrupted CONCURRENTLY build leaves an invalid index behind
+                conn.execute(text(f"DROP INDEX CONCURRENTLY {spec.name}"))
+            if spec.prepare:
+                spec.prepare(conn)
+            conn.execute(text(
+                f"CREATE {'UNIQUE ' if spec.unique else ''}INDEX {'CONCURRENTLY ' if postgres else ''}"
+                f"IF NOT EXISTS {spec.name} ON {spec.table} ({spec.columns})"
+            ))
+            created.append(spec.name)
+            logger.info(f"Created index {spec.name}")
+        if not missing_indexes(conn):
+            for name in OBSOLETE_INDEXES:
+                conn.execute(text(f"DROP INDEX {'CONCURRENTLY ' if postgres else ''}IF EXISTS {name}"))
+    return created
+
+
+def migrate_chat_search(engine: Engine) -> None:
+    """Add the full-text column and index to an existing chat_history."""
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        if not inspect(conn).has_table("chat_history"):
+            return
+        concurrently = False
+        if engine.dialect.name == "postgresql":
+            if _index_state(conn, SEARCH_INDEX) is False:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY {SEARCH_INDEX}"))
+            # Postgres can't build an index on a partitioned table concurrently
+            concurrently = not is_partitioned(conn)
+        setup_chat_search(conn, concurrently=concurrently)
+
+
+def check_indexes(engine: Engine) -> None:
+    """Startup check for INDEXES.
+
+    SQLite builds anything missing straight away. On Postgres an index build
+    on a live table belongs in `python -m app.db.migrations`, so startup only
+    reports what is missing.
+    """
+    if engine.dialect.name != "postgresql":
+        create_indexes(engine)
+        return
+    with engine.connect() as conn:
+        missing = [spec.name for spec in missing_indexes(conn)]
+    if missing:
+        logger.warning(f"Missing indexes {', '.join(missing)}; run `python -m app.db.migrations`")
+
+
+if __name__ == "__main__":
+    from app.db.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    created = create_indexes(engine)
+    migrate_chat_search(engine)
+    print(f"Created {', '.join(created)}" if created else "All indexes already exist")
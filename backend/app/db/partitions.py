@@ -0,0 +1,164 @@
+import logging
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# Months past the current one that always have a partition ready
+MONTHS_AHEAD = 2
+PARTITION_LOCK_ID = 0x70617274
+
+_CHAT_COLUMNS = "id, chat_id, user_id, title, user_message, bot_response, timestamp"
+
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"chat_history_y{month.year:04d}m{month.month:02d}"
+
+
+def month_range(first: date, last: date) -> List[date]:
+    months = []
+    while first <= last:
+        months.append(first)
+        first = add_months(first, 1)
+    return months
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return bool(conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('chat_history')"
+    )).first())
+
+
+def create_month_partition(conn: Connection, month: date) -> None:
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF chat_history "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+
+
+def ensure_month_partitions(conn: Connection, now: Optional[datetime] = None) -> None:
+    """Create partitions for this month and the next `MONTHS_AHEAD`.
+
+    Only current and future months are created, since an older range may
+    already have rows sitting in the default partition.
+    """
+    current = month_start(now or datetime.now(timezone.utc))
+    for month in month_range(current, add_months(current, MONTHS_AHEAD)):
+        create_month_partition(conn, month)
+
+
+def _convert_to_partitioned(conn: Connection) -> None:
+    """Rebuild chat_history as a table range-partitioned by month on timestamp.
+
+    The partition key has to be part of the primary key, so the table's key
+    becomes (id, timestamp); ids still come from the original sequence and
+    stay unique, which is all the ORM mapping relies on.
+    """
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence('chat_history', 'id')")).scalar()
+    first, = conn.execute(text("SELECT min(timestamp) FROM chat_history")).first()
+
+    conn.execute(text("ALTER TABLE chat_history RENAME TO chat_history_unpartitioned"))
+    conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+    conn.execute(text(
+        "CREATE TABLE chat_history ("
+        f"id INTEGER NOT NULL DEFAULT nextval('{sequence}'), "
+        "chat_id VARCHAR, "
+        "user_id INTEGER REFERENCES users (id), "
+        "title VARCHAR, "
+        "user_message VARCHAR, "
+        "bot_response TEXT, "
+        "timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+        # Named so it can't collide with the old table's chat_history_pkey
+        "CONSTRAINT chat_history_partitioned_pkey PRIMARY KEY (id, timestamp)"
+        ") PARTITION BY RANGE (timestamp)"
+    ))
+    conn.execute(text("CREATE TABLE chat_history_default PARTITION OF chat_history DEFAULT"))
+
+    current = month_start(datetime.now(timezone.utc))
+    for month in month_range(month_start(first) if first else current, current):
+        create_month_partition(conn, month)
+    ensure_month_partitions(conn)
+
+    conn.execute(text(
+        f"INSERT INTO chat_history ({_CHAT_COLUMNS}) "
+        "SELECT id, chat_id, user_id, title, user_message, bot_response, coalesce(timestamp, now()) "
+        "FROM chat_history_unpartitioned"
+    ))
+    conn.execute(text("DROP TABLE chat_history_unpartitioned"))
+    conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY chat_history.id"))
+    conn.execute(text("CREATE INDEX ix_chat_history_chat_id ON chat_history (chat_id)"))
+    conn.execute(text(
+        "CREATE INDEX ix_chat_history_user_id_timestamp ON chat_history (user_id, timestamp)"
+    ))
+    logger.info("Converted chat_history to monthly partitions")
+
+
+def _lock(conn: Connection) -> None:
+    # Held until the surrounding transaction ends; other workers wait here
+    # instead of racing the same DDL
+    conn.execute(text(f"SELECT pg_advisory_xact_lock({PARTITION_LOCK_ID})"))
+
+
+def migrate_chat_history(conn: Connection) -> bool:
+    """Convert chat_history to monthly partitions; returns whether it converted.
+
+    This copies the whole table, so it is run explicitly with
+    `python -m app.db.partitions` rather than on application startup.
+    """
+    if conn.dialect.name != "postgresql":
+        return False
+    _lock(conn)
+    converted = not is_partitioned(conn)
+    if converted:
+        _convert_to_partitioned(conn)
+    ensure_month_partitions(conn)
+    return converted
+
+
+def maintain_chat_partitions(conn: Connection) -> None:
+    """Create upcoming month partitions if chat_history has been migrated."""
+    if conn.dialect.name != "postgresql" or not is_partitioned(conn):
+        return
+    _lock(conn)
+    ensure_month_partitions(conn)
+
+
+def expired_partitions(conn: Connection, cutoff: date) -> List[Tuple[str, date]]:
+    """Month partitions whose whole range falls before `cutoff`."""
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'chat_history'::regclass"
+    )).scalars()
+    expired = []
+    for name in names:
+        if name == "chat_history_default":
+            continue
+        month = date(int(name[-7:-3]), int(name[-2:]), 1)
+        if add_months(month, 1) <= cutoff:
+            expired.append((name, month))
+    return sorted(expired, key=lambda item: item[1])
+
+
+if __name__ == "__main__":
+    from app.db.chat_search import setup_chat_search
+    from app.db.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.begin() as conn:
+        converted = migrate_chat_history(conn)
+    # Conversion drops the full-text column and index; put them back
+    with engine.begin() as conn:
+        setup_chat_search(conn)
+    print("chat_history converted to monthly partitions" if converted else "chat_history already partitioned")
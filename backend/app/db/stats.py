@@ -0,0 +1,135 @@
+import logging
+import threading
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, exists, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.bulk import on_batch_written
+from app.db.database import SessionLocal
+from app.models.product import Product
+from app.models.stats import PriceStats, SupplierStats
+
+logger = logging.getLogger(__name__)
+
+# Batches touching more rows than this rebuild every aggregate in one GROUP BY
+# pass instead of refreshing only the keys they touched.
+KEYED_REFRESH_LIMIT = 500
+# Advisory lock so only one worker runs a reconciliation round on Postgres
+STATS_LOCK_ID = 0x73746174
+
+
+def _upsert(db: Session, model, keys: List[str], rows: List[dict]) -> None:
+    """Insert or overwrite aggregate rows in place.
+
+    Concurrent refreshes of the same key then both succeed instead of one
+    hitting a primary-key violation between a DELETE and an INSERT.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        for row in rows:
+            db.merge(model(**row))
+        return
+    insert_ = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert_(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={c: stmt.excluded[c] for c in rows[0] if c not in keys},
+    )
+    db.execute(stmt, rows)
+
+
+def _refresh_supplier_stats(db: Session, supplier_ids: Optional[Iterable[int]] = None) -> None:
+    stmt = select(Product.supplier_id, func.count(Product.id)).where(
+        Product.supplier_id.isnot(None)
+    ).group_by(Product.supplier_id)
+    # Suppliers left without products
+    clear = delete(SupplierStats).where(
+        ~exists().where(Product.supplier_id == SupplierStats.supplier_id)
+    )
+    if supplier_ids is not None:
+        supplier_ids = list(supplier_ids)
+        stmt = stmt.where(Product.supplier_id.in_(supplier_ids))
+        clear = clear.where(SupplierStats.supplier_id.in_(supplier_ids))
+
+    rows = [{"supplier_id": s, "product_count": c} for s, c in db.execute(stmt)]
+    db.execute(clear, execution_options={"synchronize_session": False})
+    _upsert(db, SupplierStats, ["supplier_id"], rows)
+
+
+def _refresh_price_stats(db: Session, dimension: str, values: Optional[Iterable[str]] = None) -> None:
+    column = getattr(Product, dimension)
+    stmt = select(
+        column, func.count(Product.id), func.min(Product.price),
+        func.max(Product.price), func.avg(Product.price)
+    ).where(column.isnot(None)).group_by(column)
+    # Values no product carries any more
+    clear = delete(PriceStats).where(
+        PriceStats.dimension == dimension, ~exists().where(column == PriceStats.value)
+    )
+    if values is not None:
+        values = list(values)
+        stmt = stmt.where(column.in_(values))
+        clear = clear.where(PriceStats.value.in_(values))
+
+    rows = [
+        {"dimension": dimension, "value": value, "product_count": count,
+         "min_price": low, "max_price": high, "avg_price": avg}
+        for value, count, low, high, avg in db.execute(stmt)
+    ]
+    db.execute(clear, execution_options={"synchronize_session": False})
+    _upsert(db, PriceStats, ["dimension", "value"], rows)
+
+
+def refresh_product_stats(db: Session, rows: Optional[List[dict]] = None) -> None:
+    """Recompute aggregates for the keys in `rows`, or all of them when None."""
+    if rows is None or len(rows) > KEYED_REFRESH_LIMIT:
+        _refresh_supplier_stats(db)
+        _refresh_price_stats(db, "category")
+        _refresh_price_stats(db, "brand")
+    else:
+        _refresh_supplier_stats(db, {r["supplier_id"] for r in rows})
+        _refresh_price_stats(db, "category", {r["category"] for r in rows})
+        _refresh_price_stats(db, "brand", {r["brand"] for r in rows})
+    db.commit()
+
+
+def backfill_product_stats(db: Session) -> None:
+    if db.execute(select(PriceStats.value).limit(1)).first():
+        return
+    refresh_product_stats(db)
+
+
+def reconcile_product_stats() -> None:
+    """Rebuild every aggregate, repairing anything a failed refresh left wrong."""
+    with SessionLocal() as db:
+        if db.get_bind().dialect.name == "postgresql" and not db.execute(
+            text(f"SELECT pg_try_advisory_xact_lock({STATS_LOCK_ID})")
+        ).scalar():
+            return
+        refresh_product_stats(db)
+
+
+def _reconcile_loop(stop: threading.Event) -> None:
+    while not stop.wait(settings.STATS_RECONCILE_SECONDS):
+        try:
+            reconcile_product_stats()
+        except Exception as e:
+            logger.error(f"Stats reconciliation failed: {str(e)}")
+
+
+def start_stats_reconciliation() -> threading.Event:
+    """Run `reconcile_product_stats` every STATS_RECONCILE_SECONDS; set the event to stop."""
+    stop = threading.Event()
+    threading.Thread(target=_reconcile_loop, args=(stop,), name="stats-reconcile", daemon=True).start()
+    return stop
+
+
+@on_batch_written
+def _refresh_after_ingest(db: Session, table: str, rows: List[dict]) -> None:
+    if table == "products":
+        refresh_product_stats(db, rows)
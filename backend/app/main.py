@@ -2,8 +2,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import auth, product as product_api, supplier as supplier_api, chatbot  # Rename imports
 from app.core.config import settings
-from app.db.database import engine
-from app.models import user, product as product_model, supplier as supplier_model  # Keep these for models
+from app.db.database import engine, SessionLocal
+from app.db.bulk import backfill_supplier_categories
+from app.db.stats import backfill_product_stats, start_stats_reconciliation
+from app.db.chat_search import check_chat_search
+from app.db.migrations import check_indexes
+from app.db.partitions import maintain_chat_partitions
+from app.db.archive import start_chat_maintenance
+from app.models import user, product as product_model, supplier as supplier_model, stats as stats_model, chat as chat_model  # Keep these for models
 
 # Initialize FastAPI app
 app = FastAPI()
@@ -21,6 +27,22 @@ app.add_middleware(
 user.Base.metadata.create_all(bind=engine)
 product_model.Base.metadata.create_all(bind=engine)
 supplier_model.Base.metadata.create_all(bind=engine)
+stats_model.Base.metadata.create_all(bind=engine)
+chat_model.Base.metadata.create_all(bind=engine)
+check_indexes(engine)
+
+with engine.begin() as conn:
+    maintain_chat_partitions(conn)
+    check_chat_search(conn)
+
+if settings.CHAT_RETENTION_DAYS > 0 or engine.dialect.name == "postgresql":
+    start_chat_maintenance()
+
+with SessionLocal() as db:
+    backfill_supplier_categories(db)
+    backfill_product_stats(db)
+
+start_stats_reconciliation()
 
 @app.get("/")
 async def root():
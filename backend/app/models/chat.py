@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Text
 from sqlalchemy.sql import func
 from app.db.database import Base
 import uuid
@@ -12,4 +12,27 @@ class ChatHistory(Base):
     title = Column(String, nullable=True)  
     user_message = Column(String)
     bot_response = Column(Text) 
-    timestamp = Column(DateTime(timezone=True), server_default=func.now()) 
\ No newline at end of file
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Scopes history and search queries to one user's turns
+        Index("ix_chat_history_user_id_timestamp", "user_id", "timestamp"),
+    )
+
+class ArchivedChat(Base):
+    """Which monthly archive files hold turns of a chat moved out of chat_history."""
+    __tablename__ = "archived_chats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    chat_id = Column(String, primary_key=True)
+    month = Column(String, primary_key=True)  # "YYYY-MM"
+    turns = Column(Integer, nullable=False, default=0)
+    # The chat's title and its latest turn in this month, so /history can
+    # list chats whose turns are all archived without opening the files
+    title = Column(String, nullable=True)
+    user_message = Column(String)
+    bot_response = Column(Text)
+    timestamp = Column(DateTime(timezone=True))
+    # Every user message of the chat in this month, one per line, so the
+    # chat stays searchable after its turns leave chat_history
+    messages = Column(Text)
@@ -1,14 +1,18 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Natural key used by the bulk ingest upsert
+        Index("uq_products_supplier_id_name", "supplier_id", "name", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     brand = Column(String, index=True)
-    price = Column(Float)
+    price = Column(Float, index=True)
     category = Column(String, index=True)
     description = Column(Text)
     supplier_id = Column(Integer, ForeignKey("suppliers.id"))
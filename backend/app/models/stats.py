@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from app.db.database import Base
+
+class SupplierStats(Base):
+    __tablename__ = "supplier_stats"
+
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="CASCADE"), primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+
+class PriceStats(Base):
+    """Product count and price range per category or brand."""
+    __tablename__ = "price_stats"
+
+    dimension = Column(String, primary_key=True)  # "category" or "brand"
+    value = Column(String, primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+    min_price = Column(Float)
+    max_price = Column(Float)
+    avg_price = Column(Float)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, JSON
+from sqlalchemy import Column, Integer, String, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -12,4 +12,16 @@ class Supplier(Base):
     address = Column(String)
     categories_offered = Column(JSON)  
     
-    products = relationship("Product", back_populates="supplier") 
\ No newline at end of file
+    products = relationship("Product", back_populates="supplier")
+    categories = relationship("SupplierCategory", cascade="all, delete-orphan")
+
+class SupplierCategory(Base):
+    """Indexed copy of `Supplier.categories_offered`, one row per category.
+
+    The composite primary key leads with `category`, so category -> suppliers
+    lookups are an index range scan instead of a JSON scan over every supplier.
+    """
+    __tablename__ = "supplier_categories"
+
+    category = Column(String, primary_key=True)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="CASCADE"), primary_key=True, index=True)
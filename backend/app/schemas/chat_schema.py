@@ -21,4 +21,12 @@ class ChatHistory(BaseModel):
         from_attributes = True
         json_encoders = {
             datetime: lambda v: v.isoformat()
-        } 
\ No newline at end of file
+        }
+
+class ChatSearchResult(BaseModel):
+    id: Optional[int]  # None for chats found in the archive
+    chat_id: str
+    title: Optional[str]
+    user_message: str
+    timestamp: datetime
+    rank: Optional[float]
@@ -0,0 +1,87 @@
+"""Rows/sec for per-row ORM inserts vs the chunked bulk ingest path.
+
+Run from the backend directory:
+    python -m benchmarks.bench_bulk_ingest [rows]
+
+Set BENCH_DATABASE_URL to a disposable database to run against it (its
+tables are dropped); otherwise a throwaway SQLite file is used.
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Tables are dropped and recreated, so never fall back to an exported DATABASE_URL
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from app.db.database import Base, engine, SessionLocal
+from app.db.bulk import bulk_ingest, upsert_products
+from app.models.product import Product
+from app.models import supplier  # noqa: F401  (registers the suppliers table)
+from app.schemas.product_schema import ProductCreate
+
+
+def make_rows(n, offset=0):
+    return [
+        {
+            "name": f"Item {offset + i}",
+            "brand": f"Brand {i % 50}",
+            "price": round(5 + (i % 1000) * 0.75, 2),
+            "category": f"Category {i % 20}",
+            "description": "Benchmark product " * 8,
+            "supplier_id": 1 + i % 10,
+        }
+        for i in range(n)
+    ]
+
+
+def bench_per_row(rows):
+    db = SessionLocal()
+    start = time.perf_counter()
+    for row in rows:
+        db_product = Product(**ProductCreate(**row).model_dump())
+        db.add(db_product)
+        db.commit()
+        db.refresh(db_product)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+async def _stream(payload: bytes, size: int = 64 * 1024):
+    for i in range(0, len(payload), size):
+        yield payload[i:i + size]
+
+
+def bench_bulk(rows):
+    payload = "\n".join(json.dumps(r) for r in rows).encode()
+    db = SessionLocal()
+    start = time.perf_counter()
+    summary = asyncio.run(bulk_ingest(db, _stream(payload), "ndjson", ProductCreate, "products", upsert_products))
+    elapsed = time.perf_counter() - start
+    db.close()
+    assert summary["failed"] == 0, summary
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    per_row_n = min(n, 2000)
+    elapsed = bench_per_row(make_rows(per_row_n, offset=10 ** 7))
+    print(f"per-row ORM insert  : {per_row_n:>7} rows  {per_row_n / elapsed:>10.0f} rows/s")
+
+    elapsed = bench_bulk(make_rows(n))
+    print(f"bulk insert         : {n:>7} rows  {n / elapsed:>10.0f} rows/s")
+
+    elapsed = bench_bulk(make_rows(n))
+    print(f"bulk upsert (update): {n:>7} rows  {n / elapsed:>10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
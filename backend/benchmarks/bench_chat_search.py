@@ -0,0 +1,91 @@
+"""Chat history search: substring scan vs the full-text index.
+
+Run from the backend directory:
+    python -m benchmarks.bench_chat_search [turns_per_user] [users]
+
+Set BENCH_DATABASE_URL to a disposable database to run against it (its
+tables are dropped); otherwise a throwaway SQLite file is used.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Tables are dropped and recreated, so never fall back to an exported DATABASE_URL
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import or_, select, text
+
+from app.db.chat_search import search_chat_history, setup_chat_search
+from app.db.database import Base, engine, SessionLocal
+from app.models import user  # noqa: F401  (registers the users table)
+from app.models.chat import ChatHistory
+
+COMMON = ("show me the cheapest best under over with for and from which any compare recommend "
+          "price stock shipping brand supplier").split()
+# Product vocabulary with a long tail, like real catalog terms
+TERMS = [f"{stem}{i}" for i in range(250) for stem in ("laptop", "desk", "chair", "router")]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(TERMS))]
+
+
+def seed(db, turns, users):
+    rng = random.Random(0)
+    rows = []
+    for user_id in range(1, users + 1):
+        for i in range(turns):
+            message = " ".join(rng.choices(COMMON, k=rng.randint(3, 10)) + rng.choices(TERMS, WEIGHTS, k=2))
+            rows.append({"chat_id": f"{user_id}-{i // 10}", "user_id": user_id,
+                         "title": message[:50] if i % 10 == 0 else None,
+                         "user_message": message, "bot_response": "{}"})
+            if len(rows) == 50000:
+                db.execute(text(
+                    "INSERT INTO chat_history (chat_id, user_id, title, user_message, bot_response) "
+                    "VALUES (:chat_id, :user_id, :title, :user_message, :bot_response)"
+                ), rows)
+                rows = []
+    if rows:
+        db.execute(text(
+            "INSERT INTO chat_history (chat_id, user_id, title, user_message, bot_response) "
+            "VALUES (:chat_id, :user_id, :title, :user_message, :bot_response)"
+        ), rows)
+    db.commit()
+
+
+def substring_scan(db, user_id, query):
+    # What filtering the user's history with ILIKE amounts to without an index
+    stmt = select(ChatHistory.id).where(ChatHistory.user_id == user_id)
+    for word in query.split():
+        stmt = stmt.where(or_(ChatHistory.title.ilike(f"%{word}%"), ChatHistory.user_message.ilike(f"%{word}%")))
+    return db.execute(stmt.order_by(ChatHistory.timestamp.desc()).limit(20)).all()
+
+
+def full_text(db, user_id, query):
+    return search_chat_history(db, user_id, query, limit=20, offset=0)
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        setup_chat_search(conn)
+    db = SessionLocal()
+    seed(db, turns, users)
+
+    rng = random.Random(1)
+    # Mostly mid- and long-tail terms: the "that laptop chat" kind of lookup
+    queries = [rng.choice(TERMS[20:]) for _ in range(30)]
+    for label, fn in [("substring scan", substring_scan), ("full-text index", full_text)]:
+        start = time.perf_counter()
+        for query in queries:
+            fn(db, 1, query)
+        elapsed = (time.perf_counter() - start) / len(queries)
+        print(f"{label:<16} {turns:>8} turns/user  {users} users  {elapsed * 1000:>8.2f} ms/query")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Encode time and allocations for a product search payload.
+
+Compares the previous pipeline (ORM objects -> dicts -> json.dumps ->
+json.loads -> json.dumps -> ChatResponse) with column selects encoded once
+by orjson and wrapped without re-parsing.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization [rows]
+
+Set BENCH_DATABASE_URL to a disposable database to run against it (its
+tables are dropped); otherwise a throwaway SQLite file is used.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Tables are dropped and recreated, so never fall back to an exported DATABASE_URL
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import select
+
+from app.core.serialization import dumps, dumps_str, fetch_rows
+from app.db.database import Base, engine, SessionLocal
+from app.models.product import Product
+from app.models import supplier  # noqa: F401  (registers the suppliers table)
+from app.schemas.chat_schema import ChatResponse
+
+PRODUCT_COLUMNS = (
+    Product.id, Product.name, Product.brand, Product.price,
+    Product.category, Product.description, Product.supplier_id
+)
+
+
+def orm_pipeline(db):
+    products = db.execute(select(Product)).scalars().all()
+    payload = json.dumps({
+        "products": [
+            {
+                "id": p.id,
+                "name": p.name,
+                "brand": p.brand,
+                "price": p.price,
+                "category": p.category,
+                "description": p.description,
+                "supplier_id": p.supplier_id
+            } for p in products
+        ],
+        "count": len(products)
+    })
+    payload = json.dumps(json.loads(payload))
+    return ChatResponse(response=payload, chat_id="bench").model_dump_json().encode()
+
+
+def tuple_pipeline(db):
+    products = fetch_rows(db, select(*PRODUCT_COLUMNS))
+    payload = dumps_str({"products": products, "count": len(products)})
+    return dumps({"response": payload, "chat_id": "bench"})
+
+
+def measure(fn, repeat=5):
+    db = SessionLocal()
+    fn(db)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        db.expunge_all()
+        fn(db)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    db.expunge_all()
+    tracemalloc.start()
+    fn(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    return elapsed, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add_all([
+        Product(name=f"Item {i}", brand=f"Brand {i % 50}", price=i * 0.5,
+                category=f"Category {i % 20}", description="Benchmark product " * 8,
+                supplier_id=1 + i % 10)
+        for i in range(n)
+    ])
+    db.commit()
+    db.close()
+
+    for label, fn in [("orm + 3x json", orm_pipeline), ("tuples + orjson", tuple_pipeline)]:
+        elapsed, peak = measure(fn)
+        print(f"{label:<16} {n:>7} rows  {elapsed * 1000:>8.1f} ms  peak {peak / 2 ** 20:>6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Category -> suppliers lookup: JSON containment scan vs supplier_categories.
+
+Run from the backend directory:
+    python -m benchmarks.bench_supplier_categories [suppliers]
+
+Set BENCH_DATABASE_URL to a disposable database to run against it (its
+tables are dropped); otherwise a throwaway SQLite file is used.
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Tables are dropped and recreated, so never fall back to an exported DATABASE_URL
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import select, text
+
+from app.db.bulk import sync_supplier_categories
+from app.db.database import Base, engine, SessionLocal
+from app.models import product  # noqa: F401  (registers the products table)
+from app.models.supplier import Supplier, SupplierCategory
+
+CATEGORIES = [f"Category {i}" for i in range(200)]
+
+
+def seed(db, n):
+    rng = random.Random(0)
+    categories = {}
+    rows = []
+    for i in range(1, n + 1):
+        categories[i] = rng.sample(CATEGORIES, rng.randint(1, 5))
+        rows.append({"id": i, "name": f"Supplier {i}", "email": f"s{i}@example.com", "phone": "555",
+                     "address": "1 Main St", "categories_offered": json.dumps(categories[i])})
+    db.execute(text(
+        "INSERT INTO suppliers (id, name, email, phone, address, categories_offered) "
+        "VALUES (:id, :name, :email, :phone, :address, :categories_offered)"
+    ), rows)
+    sync_supplier_categories(db, categories)
+    db.commit()
+
+
+def json_scan(db, category):
+    # What Supplier.categories_offered.contains([...]) compiles to on a plain JSON column
+    return db.execute(
+        select(Supplier.id).where(Supplier.categories_offered.like(f'%"{category}"%'))
+    ).scalars().all()
+
+
+def indexed(db, category):
+    return db.execute(
+        select(Supplier.id)
+        .join(SupplierCategory, SupplierCategory.supplier_id == Supplier.id)
+        .where(SupplierCategory.category == category)
+    ).scalars().all()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    seed(db, n)
+
+    lookups = random.Random(1).choices(CATEGORIES, k=50)
+    for label, fn in [("json scan", json_scan), ("supplier_categories", indexed)]:
+        start = time.perf_counter()
+        matched = sum(len(fn(db, category)) for category in lookups)
+        elapsed = (time.perf_counter() - start) / len(lookups)
+        print(f"{label:<20} {n:>8} suppliers  {elapsed * 1000:>8.2f} ms/lookup  ({matched // len(lookups)} rows avg)")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Per-model latency, escalation rate and accuracy on a labelled query set.
+
+Evaluates every model in ANALYZER_MODELS on its own, then the cascade.
+Requires GROQ_API_KEY. Run from the backend directory:
+    python -m benchmarks.eval_analyzer_cascade [benchmarks/analyzer_queries.jsonl]
+"""
+import json
+import os
+import sys
+import time
+
+from langchain.schema import HumanMessage, SystemMessage
+from langchain_groq import ChatGroq
+
+from app.bot.cascade import ModelCascade
+from app.bot.graph import ANALYZER_PROMPT, GROQ_API_KEY
+from app.bot.vocabulary import normalize
+from app.core.config import settings
+
+
+def correct(analysis, expected) -> bool:
+    if not isinstance(analysis, dict) or analysis.get("query_type") != expected["query_type"]:
+        return False
+    entities = analysis.get("entities") or {}
+    for field, value in expected["entities"].items():
+        got = entities.get(field)
+        if isinstance(value, (int, float)):
+            if got is None or float(got) != float(value):
+                return False
+        elif got is None or normalize(got) != normalize(value):
+            return False
+    return True
+
+
+def evaluate(label, cascade, labelled):
+    hits, elapsed = 0, 0.0
+    for example in labelled:
+        messages = [SystemMessage(content=ANALYZER_PROMPT), HumanMessage(content=example["query"])]
+        start = time.perf_counter()
+        try:
+            analysis = cascade.run(messages)
+        except Exception:
+            analysis = None
+        elapsed += time.perf_counter() - start
+        hits += correct(analysis, example)
+
+    print(f"{label:<40} accuracy {hits / len(labelled):>6.1%}  avg {1000 * elapsed / len(labelled):>7.0f} ms/query")
+    for name, stats in cascade.stats().items():
+        print(f"    {name:<36} calls {stats['calls']:>3}  {stats['avg_latency_ms']:>7.0f} ms  "
+              f"rejected {stats['rejection_rate']:>6.1%}")
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "analyzer_queries.jsonl")
+    with open(path) as f:
+        labelled = [json.loads(line) for line in f if line.strip()]
+
+    models = [
+        (name, ChatGroq(model=name, temperature=0.2, api_key=GROQ_API_KEY))
+        for name in settings.ANALYZER_MODELS.split(",")
+    ]
+    for model in models:
+        evaluate(model[0], ModelCascade([model], min_confidence=0), labelled)
+    evaluate("cascade", ModelCascade(models, settings.ANALYZER_MIN_CONFIDENCE), labelled)
+
+
+if __name__ == "__main__":
+    main()
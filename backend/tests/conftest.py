@@ -0,0 +1,32 @@
+import os
+import tempfile
+
+import pytest
+
+# Tests write to and delete from the database, so never use an exported DATABASE_URL
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    from app.db.database import Base, engine
+    from app.models import chat, product, stats, supplier, user  # noqa: F401  (registers the tables)
+
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api import product as product_api, supplier as supplier_api
+    from app.db import stats  # noqa: F401  (registers the refresh listener)
+
+    app = FastAPI()
+    app.include_router(product_api.router, prefix="/products")
+    app.include_router(supplier_api.router, prefix="/suppliers")
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,81 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.db.archive import archive_expired_chats, archive_path, load_archived_turns, read_archive
+from app.db.chat_search import search_chat_history, setup_chat_search
+from app.db.database import SessionLocal
+from app.db.partitions import add_months, month_range, partition_name
+from app.models.chat import ArchivedChat, ChatHistory
+from app.schemas.chat_schema import ChatHistory as ChatHistorySchema
+
+NOW = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def chat_search(database):
+    with database.begin() as conn:
+        setup_chat_search(conn)
+
+
+def add_turn(db, user_id, chat_id, message, timestamp, title=None):
+    db.add(ChatHistory(chat_id=chat_id, user_id=user_id, title=title, user_message=message,
+                       bot_response='{"products": []}', timestamp=timestamp))
+    db.commit()
+
+
+def test_month_helpers():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert month_range(date(2026, 11, 1), date(2027, 1, 1)) == [
+        date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1)]
+    assert partition_name(date(2026, 3, 1)) == "chat_history_y2026m03"
+
+
+def test_expired_months_move_to_archive_and_rehydrate(tmp_path):
+    db = SessionLocal()
+    add_turn(db, 921, "old", "laptops under 1000", datetime(2026, 1, 5, 10), title="Laptops")
+    add_turn(db, 921, "old", "which has most RAM", datetime(2026, 1, 5, 11))
+    add_turn(db, 921, "old", "and the cheapest one", datetime(2026, 2, 1, 9))
+    add_turn(db, 921, "recent", "standing desks", datetime(2026, 10, 1, 9))
+
+    # 90 days before NOW falls in July, so everything before July 1st goes
+    assert archive_expired_chats(db, 90, str(tmp_path), now=NOW) == 3
+    hot = db.query(ChatHistory).filter(ChatHistory.user_id == 921).all()
+    assert [turn.chat_id for turn in hot] == ["recent"]
+    assert len(read_archive(archive_path(str(tmp_path), 921, "2026-01"))) == 2
+    assert {(a.month, a.turns) for a in db.query(ArchivedChat).filter(ArchivedChat.chat_id == "old")} == {
+        ("2026-01", 2), ("2026-02", 1)}
+    # Enough to list the chat in /history without opening the archive
+    listed = db.get(ArchivedChat, (921, "old", "2026-02"))
+    assert (listed.title, listed.user_message) == ("Laptops", "and the cheapest one")
+    assert ChatHistorySchema.model_validate(listed).timestamp.month == 2
+
+    turns = sorted(load_archived_turns(db, 921, "old", str(tmp_path)), key=lambda t: t["timestamp"])
+    assert [t["user_message"] for t in turns] == ["laptops under 1000", "which has most RAM", "and the cheapest one"]
+    assert ChatHistorySchema.model_validate(turns[0]).bot_response == '{"products": []}'
+    assert load_archived_turns(db, 922, "old", str(tmp_path)) == []
+
+    # Nothing left to move; a late turn for an archived month is merged in
+    assert archive_expired_chats(db, 90, str(tmp_path), now=NOW) == 0
+    add_turn(db, 921, "old", "thanks", datetime(2026, 1, 6, 8))
+    assert archive_expired_chats(db, 90, str(tmp_path), now=NOW) == 1
+    assert len(read_archive(archive_path(str(tmp_path), 921, "2026-01"))) == 3
+    assert db.get(ArchivedChat, (921, "old", "2026-01")).turns == 3
+
+    # Archived chats stay searchable, after the live matches
+    found = search_chat_history(db, 921, "cheapest", 10, 0)
+    assert [(r["id"], r["chat_id"], r["user_message"]) for r in found] == [(None, "old", "and the cheapest one")]
+    assert search_chat_history(db, 921, "ram", 10, 0)[0]["user_message"] == "which has most RAM"
+    assert search_chat_history(db, 922, "cheapest", 10, 0) == []
+    add_turn(db, 921, "recent", "cheapest standing desk", datetime(2026, 10, 2, 9))
+    assert [r["chat_id"] for r in search_chat_history(db, 921, "cheapest", 10, 0)] == ["recent", "old"]
+    assert [r["chat_id"] for r in search_chat_history(db, 921, "cheapest", 1, 1)] == ["old"]
+    db.close()
+
+
+def test_archive_dir_must_be_absolute():
+    db = SessionLocal()
+    with pytest.raises(ValueError):
+        archive_expired_chats(db, 90, "chat_archive", now=NOW)
+    db.close()
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+from app.bot.batching import MicroBatcher, order_by_id
+
+
+def test_concurrent_calls_share_batches():
+    sizes = []
+
+    def handler(items):
+        sizes.append(len(items))
+        return [item * 2 if item != 3 else ValueError("bad item") for item in items]
+
+    batcher = MicroBatcher(handler, window=0.05, max_size=4)
+    results, errors = {}, {}
+    barrier = threading.Barrier(8)
+
+    def call(i):
+        barrier.wait()
+        try:
+            results[i] = batcher.submit(i)
+        except ValueError as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {i: i * 2 for i in range(8) if i != 3}
+    assert list(errors) == [3]
+    assert sum(sizes) == 8 and len(sizes) < 8
+    stats = batcher.stats()
+    assert stats["requests"] == 8 and stats["batches"] == len(sizes)
+
+
+def test_handler_failure_reaches_every_caller():
+    def handler(items):
+        raise RuntimeError("groq down")
+
+    batcher = MicroBatcher(handler, window=0.001, max_size=8)
+    with pytest.raises(RuntimeError):
+        batcher.submit("query")
+
+
+def test_order_by_id():
+    reply = [{"id": 1, "query_type": "supplier_search"}, {"id": 0, "query_type": "product_search"}]
+    assert order_by_id(reply, 2) == [{"query_type": "product_search"}, {"query_type": "supplier_search"}]
+    assert order_by_id([{"id": 0}, {"id": 0}], 2) is None
+    assert order_by_id([{"id": 0}, {"query_type": "product_search"}], 2) is None
+    assert order_by_id([{"id": 0}, {"id": 2}], 2) is None
+    assert order_by_id([{"id": 0}], 2) is None
@@ -0,0 +1,94 @@
+import json
+
+from app.db.database import SessionLocal
+from app.db.bulk import backfill_supplier_categories, sync_supplier_categories
+from app.models.product import Product
+from app.models.supplier import Supplier, SupplierCategory
+
+
+def test_bulk_suppliers_csv_upsert(client):
+    body = (
+        "name,email,phone,address,categories_offered\n"
+        "Bulk Co,bulk@example.com,555,1 Main St,Electronics;Gaming\n"
+        "Bad Co,not-an-email,555,2 Main St,Electronics\n"
+    )
+    response = client.post("/suppliers/bulk", content=body, headers={"content-type": "text/csv"})
+    summary = response.json()
+    assert summary["inserted"] == 1
+    assert summary["failed"] == 1
+    assert summary["chunks"][0]["errors"][0]["line"] == 3
+
+    body = "name,email,phone,address,categories_offered\nBulk Co Ltd,bulk@example.com,555,1 Main St,[\"Gaming\"]\n"
+    summary = client.post("/suppliers/bulk", content=body, headers={"content-type": "text/csv"}).json()
+    assert summary["updated"] == 1 and summary["inserted"] == 0
+
+    db = SessionLocal()
+    supplier = db.query(Supplier).filter(Supplier.email == "bulk@example.com").one()
+    assert supplier.name == "Bulk Co Ltd"
+    assert supplier.categories_offered == ["Gaming"]
+    categories = db.query(SupplierCategory.category).filter(SupplierCategory.supplier_id == supplier.id).all()
+    assert categories == [("Gaming",)]
+    db.close()
+
+
+def test_bulk_products_ndjson_chunks(client):
+    rows = [
+        {"name": f"Widget {i}", "brand": "Acme", "price": 10 + i, "category": "Tools",
+         "description": "A widget", "supplier_id": 1}
+        for i in range(5)
+    ]
+    body = "\n".join(json.dumps(r) for r in rows) + "\n{broken\n"
+    summary = client.post(
+        "/products/bulk", content=body, headers={"content-type": "application/x-ndjson"}
+    ).json()
+    assert summary["inserted"] == 5
+    assert summary["failed"] == 1
+
+    rows[0]["price"] = 99
+    summary = client.post("/products/bulk", content=json.dumps(rows[0])).json()
+    assert summary["updated"] == 1
+
+    # Replaying the whole feed updates every row in place
+    summary = client.post("/products/bulk", content="\n".join(json.dumps(r) for r in rows)).json()
+    assert (summary["inserted"], summary["updated"]) == (0, 5)
+
+    db = SessionLocal()
+    assert db.query(Product).filter(Product.name == "Widget 0").one().price == 99
+    assert db.query(Product).filter(Product.name.like("Widget %")).count() == 5
+    db.close()
+
+    duplicate = client.post("/products/", json=rows[1])
+    assert duplicate.status_code == 400
+
+
+def test_bulk_csv_quoted_newlines_and_column_count(client):
+    body = (
+        "name,brand,price,category,description,supplier_id\n"
+        'Quoted Lamp,Acme,20,Lighting,"Warm light.\nDimmable, ""smart"" ready",7\n'
+        "Extra Lamp,Acme,25,Lighting,Plain,7,surplus\n"
+        "Short Lamp,Acme,30\n"
+    )
+    summary = client.post("/products/bulk", content=body, headers={"content-type": "text/csv"}).json()
+    assert summary["inserted"] == 1
+    assert [e["line"] for e in summary["chunks"][0]["errors"]] == [4, 5]
+    assert "got 7" in summary["chunks"][0]["errors"][0]["error"]
+
+    db = SessionLocal()
+    assert db.query(Product).filter(Product.name == "Quoted Lamp").one().description == \
+        'Warm light.\nDimmable, "smart" ready'
+    db.close()
+
+
+def test_supplier_category_backfill_is_idempotent():
+    db = SessionLocal()
+    supplier = Supplier(name="Backfill Co", email="backfill@example.com", phone="555",
+                        address="3 Main St", categories_offered=["Audio", "Audio", "Video"])
+    db.add(supplier)
+    db.commit()
+    sync_supplier_categories(db, {supplier.id: supplier.categories_offered})
+    sync_supplier_categories(db, {supplier.id: supplier.categories_offered})
+    backfill_supplier_categories(db)
+    db.commit()
+    categories = db.query(SupplierCategory.category).filter(SupplierCategory.supplier_id == supplier.id)
+    assert sorted(c for c, in categories) == ["Audio", "Video"]
+    db.close()
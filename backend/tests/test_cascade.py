@@ -0,0 +1,55 @@
+import json
+
+from app.bot.cascade import ModelCascade, validate_analysis
+
+
+class FakeModel:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return type("Response", (), {"content": self.answer if isinstance(self.answer, str) else json.dumps(self.answer)})
+
+
+GOOD = {"query_type": "product_search", "entities": {"category": "gaming", "max_price": 500}, "confidence": 0.9}
+
+
+def test_validate_analysis():
+    assert validate_analysis(GOOD) is None
+    assert "query_type" in validate_analysis({**GOOD, "query_type": "weather"})
+    assert "unknown entity" in validate_analysis({**GOOD, "entities": {"colour": "red"}})
+    assert "max_price" in validate_analysis({**GOOD, "entities": {"max_price": "cheap"}})
+    assert "min_price" in validate_analysis({**GOOD, "entities": {"min_price": True}})
+
+    analysis = {**GOOD, "entities": {"min_price": " 50 ", "max_price": "500"}}
+    assert validate_analysis(analysis) is None
+    assert analysis["entities"] == {"min_price": 50.0, "max_price": 500.0}
+
+
+def test_small_model_answer_is_used_when_valid():
+    small, large = FakeModel(GOOD), FakeModel(GOOD)
+    cascade = ModelCascade([("small", small), ("large", large)], min_confidence=0.7)
+    assert cascade.run([]) == GOOD
+    assert (small.calls, large.calls) == (1, 0)
+
+
+def test_escalates_on_invalid_or_unsure_output():
+    large = FakeModel(GOOD)
+    cascade = ModelCascade([("small", FakeModel("not json")), ("large", large)], min_confidence=0.7)
+    assert cascade.run([]) == GOOD
+    assert cascade.stats()["small"]["rejection_rate"] == 1
+
+    unsure = {**GOOD, "confidence": 0.3}
+    cascade = ModelCascade([("small", FakeModel(unsure)), ("large", FakeModel({**unsure, "confidence": 0.5}))],
+                           min_confidence=0.7)
+    assert cascade.run([])["confidence"] == 0.5
+
+    # Leaving confidence out counts as unsure, not as fully confident
+    silent = {key: value for key, value in GOOD.items() if key != "confidence"}
+    small, large = FakeModel(silent), FakeModel(GOOD)
+    cascade = ModelCascade([("small", small), ("large", large)], min_confidence=0.7)
+    assert cascade.run([]) == GOOD
+    assert (small.calls, large.calls) == (1, 1)
+    assert ModelCascade([("small", small)], min_confidence=0).review(silent) == (None, True)
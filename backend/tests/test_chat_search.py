@@ -0,0 +1,57 @@
+import pytest
+
+from app.db.chat_search import search_chat_history, setup_chat_search
+from app.db.database import SessionLocal
+from app.models.chat import ChatHistory
+
+
+@pytest.fixture(scope="module", autouse=True)
+def chat_search(database):
+    with database.begin() as conn:
+        setup_chat_search(conn)
+        # A second run must be a no-op
+        setup_chat_search(conn)
+
+
+def add_turns(db, user_id, turns):
+    for chat_id, title, message in turns:
+        db.add(ChatHistory(chat_id=chat_id, user_id=user_id, title=title,
+                           user_message=message, bot_response="{}"))
+    db.commit()
+
+
+def test_search_is_ranked_and_scoped_to_user():
+    db = SessionLocal()
+    add_turns(db, 901, [
+        ("laptops", "Gaming laptops", "Show me gaming laptops under 1500"),
+        ("laptops", None, "Which of those laptops has the most RAM?"),
+        ("desks", "Standing desks", "Any standing desks from ErgoLife?"),
+    ])
+    add_turns(db, 902, [("other", "Laptops", "Cheap laptops please")])
+
+    results = search_chat_history(db, 901, "laptop", limit=10, offset=0)
+    assert [r["chat_id"] for r in results] == ["laptops", "laptops"]
+    # The title match outranks the follow-up turn
+    assert results[0]["title"] == "Gaming laptops"
+    assert results[0]["rank"] > results[1]["rank"]
+
+    assert search_chat_history(db, 901, "laptop", limit=1, offset=1)[0]["id"] == results[1]["id"]
+    assert search_chat_history(db, 901, 'desks" OR laptops', limit=10, offset=0) == []
+    assert search_chat_history(db, 901, "?!", limit=10, offset=0) == []
+    db.close()
+
+
+def test_index_follows_updates_and_deletes():
+    db = SessionLocal()
+    add_turns(db, 903, [("chairs", "Office chairs", "Ergonomic chairs with lumbar support")])
+    turn = db.query(ChatHistory).filter(ChatHistory.user_id == 903).one()
+
+    turn.user_message = "Recliners with cup holders"
+    db.commit()
+    assert search_chat_history(db, 903, "lumbar", limit=10, offset=0) == []
+    assert len(search_chat_history(db, 903, "recliner", limit=10, offset=0)) == 1
+
+    db.delete(turn)
+    db.commit()
+    assert search_chat_history(db, 903, "recliner", limit=10, offset=0) == []
+    db.close()
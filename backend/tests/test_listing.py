@@ -0,0 +1,56 @@
+import pytest
+
+from app.db.database import SessionLocal
+from app.models.product import Product
+
+
+@pytest.fixture(scope="module", autouse=True)
+def pager_products(database):
+    db = SessionLocal()
+    db.add_all([
+        Product(name=f"Listing {i}", brand="Pager", price=i, category="Paging",
+                description="long text " * 50, supplier_id=7)
+        for i in range(25)
+    ])
+    db.commit()
+    db.close()
+
+
+def test_keyset_pages_cover_all_rows_once(client):
+    seen, after_id = [], None
+    while True:
+        params = {"brand": "Pager", "limit": 10, "fields": "name,price"}
+        if after_id is not None:
+            params["after_id"] = after_id
+        response = client.get("/products/", params=params)
+        page = response.json()
+        assert all(set(row) == {"id", "name", "price"} for row in page)
+        seen.extend(row["id"] for row in page)
+        after_id = response.headers.get("x-next-cursor")
+        if after_id is None:
+            break
+    assert len(seen) == len(set(seen)) == 25
+    assert seen == sorted(seen)
+
+
+def test_etag_not_modified(client):
+    response = client.get("/products/", params={"brand": "Pager", "limit": 5})
+    etag = response.headers["etag"]
+    cached = client.get("/products/", params={"brand": "Pager", "limit": 5}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    for header in (f"W/{etag}", f'"stale", {etag}', "*"):
+        assert client.get("/products/", params={"brand": "Pager", "limit": 5},
+                          headers={"If-None-Match": header}).status_code == 304
+    assert client.get("/products/", params={"brand": "Pager", "limit": 5},
+                      headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_openapi_does_not_promise_full_rows(client):
+    schema = client.app.openapi()["paths"]["/products/"]["get"]["responses"]["200"]
+    assert "schema" not in schema.get("content", {}).get("application/json", {})
+
+
+def test_unknown_field_rejected(client):
+    assert client.get("/products/", params={"fields": "name,secret"}).status_code == 400
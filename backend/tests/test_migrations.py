@@ -0,0 +1,45 @@
+import tempfile
+
+from sqlalchemy import create_engine, text
+
+from app.db.migrations import check_indexes, create_indexes, migrate_chat_search, missing_indexes
+
+
+def test_unique_product_key_added_to_existing_table():
+    engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/old.db")
+    with engine.begin() as conn:
+        # products as created before the natural key was unique
+        conn.execute(text("CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR, brand VARCHAR, "
+                          "price FLOAT, category VARCHAR, description TEXT, supplier_id INTEGER)"))
+        conn.execute(text("CREATE INDEX ix_products_supplier_id_name ON products (supplier_id, name)"))
+        conn.execute(text("INSERT INTO products (name, price, supplier_id) VALUES "
+                          "('Lamp', 10, 1), ('Lamp', 12, 1), ('Lamp', 15, 2), ('Loose', 1, NULL), ('Loose', 2, NULL)"))
+        assert [spec.name for spec in missing_indexes(conn)] == ["uq_products_supplier_id_name", "ix_products_price"]
+
+    check_indexes(engine)
+    with engine.begin() as conn:
+        assert missing_indexes(conn) == []
+        assert conn.execute(text("SELECT supplier_id, price FROM products WHERE name = 'Lamp' "
+                                 "ORDER BY supplier_id")).all() == [(1, 12), (2, 15)]
+        assert conn.execute(text("SELECT count(*) FROM products WHERE supplier_id IS NULL")).scalar() == 2
+        assert conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'ix_products_supplier_id_name'")).first() is None
+    assert create_indexes(engine) == []
+
+
+def test_nothing_to_migrate_before_tables_exist():
+    engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/empty.db")
+    assert create_indexes(engine) == []
+
+
+def test_chat_search_added_by_migration():
+    engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/old.db")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE chat_history (id INTEGER PRIMARY KEY, chat_id VARCHAR, user_id INTEGER, "
+                          "title VARCHAR, user_message VARCHAR, bot_response TEXT, timestamp DATETIME)"))
+        conn.execute(text("INSERT INTO chat_history (chat_id, user_id, user_message) VALUES ('c', 1, 'old laptop')"))
+
+    migrate_chat_search(engine)
+    migrate_chat_search(engine)
+    assert create_indexes(engine) == ["ix_chat_history_user_id_timestamp"]
+    with engine.begin() as conn:
+        assert conn.execute(text("SELECT rowid FROM chat_history_fts WHERE chat_history_fts MATCH 'laptop'")).all() == [(1,)]
@@ -0,0 +1,72 @@
+"""Partition migration against a real Postgres.
+
+Set TEST_POSTGRES_URL to a disposable database to run these; they drop and
+recreate chat_history there.
+"""
+import os
+import threading
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.chat_search import setup_chat_search
+from app.db.database import Base
+from app.db.partitions import is_partitioned, maintain_chat_partitions, migrate_chat_history
+from app.models import user  # noqa: F401  (registers the users table)
+from app.models import chat  # noqa: F401  (registers chat_history)
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+
+@pytest.fixture
+def pg_engine():
+    engine = create_engine(POSTGRES_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS chat_history CASCADE"))
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        setup_chat_search(conn)
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'pg@example.com', 'x') "
+                          "ON CONFLICT DO NOTHING"))
+        for month in (1, 2, 3):
+            conn.execute(text(
+                "INSERT INTO chat_history (chat_id, user_id, user_message, bot_response, timestamp) "
+                "VALUES ('c', 1, 'laptop question', '{}', :ts)"
+            ), {"ts": datetime(2025, month, 10, tzinfo=timezone.utc)})
+    yield engine
+    engine.dispose()
+
+
+def test_concurrent_migrations_convert_once(pg_engine):
+    results, errors = [], []
+
+    def migrate():
+        try:
+            with pg_engine.begin() as conn:
+                results.append(migrate_chat_history(conn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=migrate) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert sorted(results) == [False, False, True]
+    with pg_engine.begin() as conn:
+        setup_chat_search(conn)
+        maintain_chat_partitions(conn)
+        assert is_partitioned(conn)
+        assert conn.execute(text("SELECT count(*) FROM chat_history_y2025m02")).scalar() == 1
+        new_id = conn.execute(text(
+            "INSERT INTO chat_history (chat_id, user_id, user_message, bot_response) "
+            "VALUES ('c', 1, 'new turn', '{}') RETURNING id"
+        )).scalar()
+        assert new_id == 4
+        assert conn.execute(text(
+            "SELECT count(*) FROM chat_history WHERE search_vector @@ to_tsquery('english', 'laptop')"
+        )).scalar() == 3
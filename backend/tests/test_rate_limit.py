@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.rate_limit import AdmissionController, MemoryRateLimiter, RedisRateLimiter
+
+
+def test_token_bucket_allows_burst_then_limits():
+    async def scenario():
+        limiter = MemoryRateLimiter(rate_per_second=1, burst=3)
+        assert [(await limiter.acquire("alice"))[0] for _ in range(3)] == [True, True, True]
+        allowed, retry_after = await limiter.acquire("alice")
+        assert not allowed and 0 < retry_after <= 1
+        assert (await limiter.acquire("bob"))[0]
+    asyncio.run(scenario())
+
+
+def test_idle_buckets_are_evicted():
+    async def scenario():
+        limiter = MemoryRateLimiter(rate_per_second=100, burst=1)
+        for user in range(50):
+            await limiter.acquire(f"user{user}")
+        time.sleep(0.02)
+        await limiter.acquire("active")
+        assert list(limiter._buckets) == ["active"]
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("fail_open", [True, False])
+def test_redis_outage_policy(fail_open):
+    async def scenario():
+        # Nothing listens on port 1
+        limiter = RedisRateLimiter("redis://127.0.0.1:1/0", rate_per_second=1, burst=1, fail_open=fail_open)
+        if fail_open:
+            assert await limiter.acquire("alice") == (True, 0.0)
+        else:
+            with pytest.raises(HTTPException) as unavailable:
+                await limiter.acquire("alice")
+            assert unavailable.value.status_code == 503
+    asyncio.run(scenario())
+
+
+def test_admission_sheds_when_queue_is_full():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=1, target_wait=0.05)
+        release = asyncio.Event()
+
+        async def hold():
+            async with admission.slot():
+                await release.wait()
+
+        async def queued():
+            async with admission.slot():
+                pass
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as timed_out:
+            async with admission.slot():
+                pass
+        assert timed_out.value.status_code == 503
+        assert "Retry-After" in timed_out.value.headers
+
+        waiter = asyncio.create_task(queued())
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as shed:
+            async with admission.slot():
+                pass
+        assert shed.value.status_code == 503
+
+        release.set()
+        await holder
+        await waiter
+    asyncio.run(scenario())
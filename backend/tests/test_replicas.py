@@ -0,0 +1,89 @@
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from app.db.database import ReplicaRouter, replication_lag
+
+
+def make_db(path, label):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS whoami (label TEXT)"))
+        conn.execute(text("DELETE FROM whoami"))
+        conn.execute(text("INSERT INTO whoami VALUES (:label)"), {"label": label})
+    return engine
+
+
+def whoami(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT label FROM whoami")).scalar()
+
+
+def test_round_robin_and_fallbacks():
+    tmp = tempfile.mkdtemp()
+    primary = make_db(f"{tmp}/primary.db", "primary")
+    make_db(f"{tmp}/replica1.db", "replica1")
+    make_db(f"{tmp}/replica2.db", "replica2")
+    lags = {"replica1": 0.0, "replica2": 0.0}
+
+    router = ReplicaRouter(
+        primary,
+        [f"sqlite:///{tmp}/replica1.db", f"sqlite:///{tmp}/replica2.db"],
+        max_lag=5,
+        check_interval=0,
+        lag_probe=lambda conn: lags[conn.execute(text("SELECT label FROM whoami")).scalar()],
+    )
+    # Nothing probed yet
+    assert whoami(router.read_engine()) == "primary"
+
+    router.check_all()
+    assert [whoami(router.read_engine()) for _ in range(4)] == ["replica1", "replica2"] * 2
+
+    lags["replica1"] = 30
+    router.check_all()
+    assert {whoami(router.read_engine()) for _ in range(4)} == {"replica2"}
+
+    lags["replica2"] = 30
+    router.check_all()
+    assert whoami(router.read_engine()) == "primary"
+
+
+def test_unreachable_replica_is_skipped():
+    tmp = tempfile.mkdtemp()
+    primary = make_db(f"{tmp}/primary.db", "primary")
+    router = ReplicaRouter(primary, [f"sqlite:///{tmp}/missing/replica.db"], max_lag=5, check_interval=60)
+    router.start()
+    deadline = time.monotonic() + 5
+    while router.replicas[0].checked_at == float("-inf") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    router.stop()
+    assert whoami(router.read_engine()) == "primary"
+    assert router.replicas[0].healthy is False
+
+
+def test_no_replicas_reads_primary():
+    primary = create_engine("sqlite://")
+    assert ReplicaRouter(primary, [], max_lag=5, check_interval=60).read_engine() is primary
+
+
+class FakeConnection:
+    class dialect:
+        name = "postgresql"
+
+    def __init__(self, row):
+        self.row = row
+
+    def execute(self, statement):
+        return self
+
+    def first(self):
+        return self.row
+
+
+def test_replication_lag_without_wal_receiver_is_unbounded():
+    assert replication_lag(FakeConnection((False, False, None, None))) == 0
+    assert replication_lag(FakeConnection((True, True, True, 7200.0))) == 0
+    assert replication_lag(FakeConnection((True, True, False, 3.5))) == 3.5
+    # Replayed everything it received, but the receiver is down
+    assert replication_lag(FakeConnection((True, False, True, 7200.0))) == float("inf")
@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.bot.speculation import Speculation, SpeculationStats, predict
+from app.bot import speculation as speculation_module
+from app.bot.vocabulary import CatalogVocabulary
+
+vocabulary = CatalogVocabulary(
+    ["Electronics", "Gaming", "Accessories", "Office Supplies"],
+    ["TechMaster", "GameMaster"],
+    {"TechPro Supplies": 1, "Global Electronics": 2},
+    ["Gaming Monitor Pro", "Wireless Mouse", "TechMaster Laptop"],
+)
+
+
+def test_predict_product_search_filters():
+    assert predict("Show me electronics under $1000", vocabulary) == (
+        "product_search", {"category": "Electronics", "max_price": 1000.0})
+    assert predict("TechMaster gaming gear between 50 and 200", vocabulary) == (
+        "product_search", {"category": "Gaming", "brand": "TechMaster", "min_price": 50.0, "max_price": 200.0})
+    assert predict("gaming monitors under $500", vocabulary) == (
+        "product_search", {"category": "Gaming", "max_price": 500.0, "product_type": "monitor"})
+
+
+def test_predict_finds_nothing_without_catalog_terms():
+    for query in ["hello there", "tell me a joke", "what's your return policy?"]:
+        assert predict(query, vocabulary) == ("product_search", {})
+
+
+def test_predict_other_query_types():
+    assert predict("What is the price range of office supplies?", vocabulary) == (
+        "catalog_stats", {"category": "Office Supplies"})
+    assert predict("Which suppliers offer gaming products?", vocabulary) == (
+        "supplier_search", {"category": "Gaming"})
+    assert predict("products from Global Electronics", vocabulary) == (
+        "supplier_products", {"supplier_name": "Global Electronics"})
+
+
+def test_take_hit_and_miss(monkeypatch):
+    stats = SpeculationStats()
+    monkeypatch.setattr(speculation_module, "speculation_stats", stats)
+    plan = ("search_products", {"query": "", "filters": {"category": "Gaming"}})
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        hit = Speculation(plan, pool, lambda args: f"rows for {args['filters']['category']}", plan[1])
+        assert hit.take(("search_products", {"query": "", "filters": {"category": "Gaming"}})) == "rows for Gaming"
+
+        release = threading.Event()
+        miss = Speculation(plan, pool, lambda args: release.wait(1) and "stale", plan[1])
+        assert miss.take(("search_products", {"query": "", "filters": {}})) is None
+        release.set()
+        miss.discard()
+
+    assert stats.snapshot()["started"] == 2
+    assert stats.snapshot()["hits"] == 1
+    assert stats.snapshot()["misses"] == 1
@@ -0,0 +1,52 @@
+import json
+
+from app.db.database import SessionLocal
+from app.db import stats  # noqa: F401  (registers the refresh listener)
+from app.db.stats import refresh_product_stats
+from app.models.product import Product
+from app.models.stats import PriceStats, SupplierStats
+
+
+def price_stats(value):
+    db = SessionLocal()
+    row = db.query(PriceStats).filter(PriceStats.dimension == "category", PriceStats.value == value).first()
+    db.close()
+    return row and (row.product_count, row.min_price, row.max_price, row.avg_price)
+
+
+def test_stats_follow_creates_and_bulk_updates(client):
+    client.post("/products/", json={"name": "Stat A", "brand": "StatBrand", "price": 10,
+                                    "category": "Stats", "description": "", "supplier_id": 42})
+    assert price_stats("Stats") == (1, 10, 10, 10)
+
+    rows = [{"name": "Stat B", "brand": "StatBrand", "price": 30, "category": "Stats",
+             "description": "", "supplier_id": 42},
+            {"name": "Stat A", "brand": "StatBrand", "price": 12, "category": "Moved Stats",
+             "description": "", "supplier_id": 42}]
+    client.post("/products/bulk", content="\n".join(json.dumps(r) for r in rows))
+
+    assert price_stats("Stats") == (1, 30, 30, 30)
+    assert price_stats("Moved Stats") == (1, 12, 12, 12)
+
+    db = SessionLocal()
+    assert db.get(SupplierStats, 42).product_count == 2
+    db.close()
+
+
+def test_refresh_overwrites_in_place_and_drops_empty_keys():
+    db = SessionLocal()
+    db.add(Product(name="Solo", brand="SoloBrand", price=5, category="Solo Stats",
+                   description="", supplier_id=43))
+    db.commit()
+    rows = [{"supplier_id": 43, "category": "Solo Stats", "brand": "SoloBrand"}]
+    refresh_product_stats(db, rows)
+    # A second refresh of the same keys updates the existing rows
+    refresh_product_stats(db, rows)
+    assert price_stats("Solo Stats") == (1, 5, 5, 5)
+
+    db.query(Product).filter(Product.name == "Solo").delete()
+    db.commit()
+    refresh_product_stats(db)
+    assert price_stats("Solo Stats") is None
+    assert db.get(SupplierStats, 43) is None
+    db.close()
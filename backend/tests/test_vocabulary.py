@@ -0,0 +1,97 @@
+import random
+import string
+import threading
+import time
+
+from app.bot.vocabulary import CatalogVocabulary, NGramIndex, normalize
+
+CATEGORIES = ["Electronics", "Gaming", "Accessories", "Furniture", "Office Supplies",
+              "Smart Home", "Security", "Sustainable Tech"]
+BRANDS = ["TechMaster", "GameMaster", "ErgoLife", "HomeSmart", "EcoTech", "SecureLife"]
+SUPPLIERS = {"TechPro Supplies": 1, "Office Solutions Inc": 2, "Global Electronics": 3,
+             "GreenTech Solutions": 4, "Smart Living Co": 5}
+
+vocabulary = CatalogVocabulary(CATEGORIES, BRANDS, SUPPLIERS)
+
+LABELLED = [
+    ("category", "electronics", "Electronics"),
+    ("category", "Electronic", "Electronics"),
+    ("category", "electornics", "Electronics"),
+    ("category", "gaming", "Gaming"),
+    ("category", "accessory", "Accessories"),
+    ("category", "office supply", "Office Supplies"),
+    ("category", "smarthome", "Smart Home"),
+    ("category", "furnitures", "Furniture"),
+    ("brand", "techmaster", "TechMaster"),
+    ("brand", "Tech Master", "TechMaster"),
+    ("brand", "TechMaster Inc", "TechMaster"),
+    ("brand", "gamemastr", "GameMaster"),
+    ("brand", "ergo life", "ErgoLife"),
+    ("supplier", "TechPro", "TechPro Supplies"),
+    ("supplier", "office solutions", "Office Solutions Inc"),
+    ("supplier", "Global Electronic", "Global Electronics"),
+    ("supplier", "greentech solution", "GreenTech Solutions"),
+    ("category", "spaceships", None),
+    ("brand", "Zorblax", None),
+]
+
+
+def test_normalize():
+    assert normalize("TechMaster Inc.") == "techmaster"
+    assert normalize("Electronics") == normalize("electronic")
+
+
+def test_lookup_accuracy():
+    correct = sum(vocabulary.canonical(kind, text) == expected for kind, text, expected in LABELLED)
+    assert correct / len(LABELLED) >= 0.9, [
+        (text, vocabulary.canonical(kind, text)) for kind, text, expected in LABELLED
+        if vocabulary.canonical(kind, text) != expected
+    ]
+
+
+def test_supplier_id_resolution():
+    assert vocabulary.supplier_id("global electronic") == 3
+    assert vocabulary.supplier_id("Nonexistent Widgets") is None
+
+
+def test_lookup_latency_on_large_vocabulary():
+    rng = random.Random(0)
+    names = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 14))) for _ in range(20000)]
+    index = NGramIndex(names)
+    queries = [name[:-1] + "x" for name in rng.sample(names, 500)]
+
+    start = time.perf_counter()
+    for query in queries:
+        index.lookup(query)
+    per_lookup = (time.perf_counter() - start) / len(queries)
+    assert per_lookup < 0.005
+
+
+def test_rebuild_runs_in_background_and_debounces(monkeypatch):
+    from app.bot import vocabulary as vocabulary_module
+
+    release, builds = threading.Event(), []
+
+    def from_db(db):
+        builds.append(db)
+        release.wait(5)
+        return CatalogVocabulary(["Rebuilt"], BRANDS, SUPPLIERS)
+
+    monkeypatch.setattr(vocabulary_module.settings, "VOCABULARY_DEBOUNCE_SECONDS", 0.2)
+    monkeypatch.setattr(vocabulary_module.CatalogVocabulary, "from_db", staticmethod(from_db))
+    monkeypatch.setattr(vocabulary_module, "_vocabulary", vocabulary)
+
+    for _ in range(5):
+        vocabulary_module.invalidate_vocabulary()
+    # Requests keep the old vocabulary while the rebuild waits and runs
+    assert vocabulary_module.get_vocabulary() is vocabulary
+    deadline = time.monotonic() + 5
+    while not builds and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert vocabulary_module.get_vocabulary() is vocabulary
+
+    release.set()
+    while vocabulary_module.get_vocabulary() is vocabulary and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert vocabulary_module.get_vocabulary().canonical("category", "rebuilt") == "Rebuilt"
+    assert len(builds) == 1